@@ -21,7 +21,7 @@ async def main():
     rag = RAG(
         base_path="/path/to/your/docs",  # Change this to your directory
         whitelist=["**/*.md", "**/*.py"],  # File patterns to include
-        blacklist=["*/archive/"],  # Patterns to exclude
+        blacklist=["**/archive/"],  # Patterns to exclude
         top_k=5  # Number of results to return
     )
 
@@ -13,16 +13,60 @@ Example:
     >>> results = await rag.search("How do I authenticate?", top_k=5)
 """
 
+import asyncio
 import hashlib
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, List, Literal, Optional, cast
+
+import numpy as np
 
-from .core.chunker import DocumentChunker, Chunk
-from .core.embeddings import VoyageEmbeddingService, EmbeddingResult
-from .core.vector_store import VectorStore, SearchResult
-from .core.file_discovery import FileDiscovery
 from .config import CollectionConfig
+from .core.chunker import Chunk, DocumentChunker
+from .core.embedding_cache import EmbeddingCache
+from .core.embeddings import (
+    SUPPORTED_OUTPUT_DTYPES,
+    EmbeddingResult,
+    VoyageEmbeddingService,
+)
+from .core.file_discovery import FileDiscovery
+from .core.vector_store import SearchResult, VectorStore
+
+# Limits for a single embedding request while indexing (tokens are counted
+# with the chunker's tokenizer, so leave headroom under Voyage's 120K limit)
+MAX_BATCH_ITEMS = 128
+MAX_BATCH_TOKENS = 60_000
+
+# Embeddings kept in the on-disk cache (float16, ~2KB each at 1024 dimensions)
+EMBEDDING_CACHE_MAX_ENTRIES = 100_000
+
+# Chunk in worker processes only when there are enough files to repay
+# the cost of starting them
+PARALLEL_CHUNKING_MIN_FILES = 16
+
+# Per-process chunkers, reused across files handled by the same worker
+_worker_chunkers: dict[tuple[int, int], DocumentChunker] = {}
+
+
+def _chunk_worker(
+    content: str,
+    file_path: str,
+    chunk_min_tokens: int,
+    chunk_max_tokens: int,
+) -> List[Chunk]:
+    """Chunk one document inside a worker process."""
+    key = (chunk_min_tokens, chunk_max_tokens)
+    chunker = _worker_chunkers.get(key)
+    if chunker is None:
+        chunker = DocumentChunker(
+            target_min_tokens=chunk_min_tokens,
+            target_max_tokens=chunk_max_tokens,
+            num_threads=1,  # The pool already runs one worker per CPU
+        )
+        _worker_chunkers[key] = chunker
+    return chunker.chunk_document(content, file_path)
 
 
 class RAG:
@@ -57,21 +101,47 @@ class RAG:
         api_key: Optional[str] = None,
         respect_gitignore: bool = True,
         max_file_size: int = 1_000_000,
+        hnsw_search_ef: int = 100,
+        quantization: Literal["float", "int8"] = "float",
+        cache_embeddings: bool = True,
+        max_concurrent_batches: int = 4,
+        query_cache_size: int = 0,
     ):
         """Initialize RAG system.
 
         Args:
             base_path: Base directory for file discovery
             whitelist: Patterns to include (e.g., ["docs/", "**/*.md"])
-            blacklist: Patterns to exclude (e.g., ["*/archive/"])
+            blacklist: Patterns to exclude (e.g., ["**/archive/"])
             chunk_min_tokens: Minimum tokens per chunk
             chunk_max_tokens: Maximum tokens per chunk
             top_k: Default number of search results to return
             api_key: Voyage AI API key (defaults to VOYAGE_API_KEY env var)
             respect_gitignore: If True, respect .gitignore files
             max_file_size: Maximum file size in bytes (default: 1MB)
+            hnsw_search_ef: HNSW search breadth; trade recall for query latency
+                (applied when the collection for base_path is first created)
+            quantization: Embedding precision requested from Voyage. "int8"
+                fetches scalar-quantized embeddings (4x smaller responses);
+                they are kept in a separate collection from float embeddings.
+            cache_embeddings: If True, cache query and chunk embeddings on disk
+                (next to the ChromaDB data) so repeated queries and re-indexed
+                chunks skip the embedding API
+            max_concurrent_batches: Maximum embedding requests in flight while
+                indexing
+            query_cache_size: Number of recent searches whose results are
+                reused for near-identical queries (0 = off). Off by default:
+                a cached answer belongs to a slightly different query.
         """
+        if quantization not in SUPPORTED_OUTPUT_DTYPES:
+            raise ValueError(
+                f"Unsupported quantization: {quantization}. "
+                f"Expected one of: {', '.join(SUPPORTED_OUTPUT_DTYPES)}"
+            )
+
         self.base_path = Path(base_path)
+        # Resolved once: used as the vector store key on every init/search
+        self._base_path_str = str(self.base_path.resolve())
         self.whitelist = whitelist
         self.blacklist = blacklist or []
         self.chunk_min_tokens = chunk_min_tokens
@@ -80,6 +150,11 @@ class RAG:
         self.api_key = api_key
         self.respect_gitignore = respect_gitignore
         self.max_file_size = max_file_size
+        self.hnsw_search_ef = hnsw_search_ef
+        self.quantization = quantization
+        self.cache_embeddings = cache_embeddings
+        self.max_concurrent_batches = max_concurrent_batches
+        self.query_cache_size = query_cache_size
 
         # Components
         self.file_discovery = FileDiscovery(
@@ -93,12 +168,24 @@ class RAG:
             target_min_tokens=chunk_min_tokens,
             target_max_tokens=chunk_max_tokens,
         )
-        self.vector_store = VectorStore()
+        self.vector_store = VectorStore(
+            collection_prefix="rag_" if quantization == "float" else f"rag_{quantization}_",
+            hnsw_search_ef=hnsw_search_ef,
+            query_cache_size=query_cache_size,
+        )
         self._embedding_service: Optional[VoyageEmbeddingService] = None
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        if cache_embeddings:
+            self._embedding_cache = EmbeddingCache(
+                self.vector_store.persist_directory / "embedding_cache.sqlite3",
+                max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+            )
 
         # State
         self.documents: dict[str, str] = {}
         self.active_file_paths: list[str] = []
+        # False when the collection holds only active files, so searches need no filter
+        self._needs_path_filter: bool = True
         self._initialized: bool = False
 
     @classmethod
@@ -125,16 +212,48 @@ class RAG:
             top_k=config.top_k,
             respect_gitignore=config.respect_gitignore,
             max_file_size=config.max_file_size,
+            hnsw_search_ef=config.hnsw_search_ef,
+            quantization=config.quantization,
+            max_concurrent_batches=config.max_concurrent_batches,
+            query_cache_size=config.query_cache_size,
         )
 
     async def _ensure_embedding_service(self) -> VoyageEmbeddingService:
         """Lazily create embedding service (needs async context)."""
         if self._embedding_service is None:
-            self._embedding_service = VoyageEmbeddingService(api_key=self.api_key)
+            self._embedding_service = VoyageEmbeddingService(
+                api_key=self.api_key,
+                max_texts_per_request=MAX_BATCH_ITEMS,
+                max_tokens_per_request=MAX_BATCH_TOKENS,
+                max_parallel=self.max_concurrent_batches,
+                cache=self._embedding_cache,
+            )
         return self._embedding_service
 
     def _compute_file_hash(self, file_path: str) -> str:
-        """Compute SHA256 hash of a single file's content.
+        """Get the BLAKE2b hash of a single file's content.
+
+        Uses the digest FileDiscovery computed over the raw bytes at read
+        time, falling back to hashing the loaded text.
+
+        Args:
+            file_path: Relative path to file
+
+        Returns:
+            BLAKE2b hex string (32 characters)
+        """
+        digest = self.file_discovery.file_hashes.get(file_path)
+        if digest is not None:
+            return digest
+
+        content = self.documents.get(file_path, "")
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _compute_legacy_file_hash(self, file_path: str) -> str:
+        """Compute the SHA256 file hash stored by earlier versions.
+
+        Only used to recognise unchanged files whose stored hash predates
+        the switch to BLAKE2b, so they are re-tagged rather than re-embedded.
 
         Args:
             file_path: Relative path to file
@@ -145,7 +264,25 @@ class RAG:
         content = self.documents.get(file_path, "")
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-    async def initialize(self) -> None:
+    @staticmethod
+    def _compute_chunk_hash(chunk_text: str) -> str:
+        """Compute a short content hash for a single chunk.
+
+        Used to reuse embeddings for chunks whose text did not change
+        when the surrounding file was edited.
+
+        Args:
+            chunk_text: Chunk content (already stripped by the chunker)
+
+        Returns:
+            BLAKE2b hex string (32 characters)
+        """
+        return hashlib.blake2b(chunk_text.encode('utf-8'), digest_size=16).hexdigest()
+
+    async def initialize(
+        self,
+        batch_mode: Literal["sync", "voyage_batch"] = "sync"
+    ) -> None:
         """Initialize RAG system: discover files and generate embeddings.
 
         This performs:
@@ -155,18 +292,29 @@ class RAG:
         Only changed files are re-embedded, making this efficient for
         large document sets.
 
+        Args:
+            batch_mode: How new chunks are embedded
+                - "sync": Concurrent requests to the embeddings endpoint
+                - "voyage_batch": One Voyage Batch API job (cheaper, but may
+                  take minutes to hours; suited to cold-start indexing)
+
         Example:
             >>> await rag.initialize()
             ✓ 15/20 files unchanged (reusing embeddings)
             🔄 5/20 new files to embed
             ✓ RAG embeddings ready (20 files, 150 total chunks)
         """
+        if batch_mode not in ("sync", "voyage_batch"):
+            raise ValueError(
+                f"Unsupported batch_mode: {batch_mode}. Expected 'sync' or 'voyage_batch'"
+            )
+
         if self._initialized:
             return
 
         # Step 1: Discover files
         print(f"📂 Discovering files in {self.base_path}...")
-        self.documents = self.file_discovery.discover()
+        self.documents = await self.file_discovery.discover_async()
 
         if not self.documents:
             print("⚠️ No documents found matching patterns")
@@ -176,49 +324,71 @@ class RAG:
         print(f"✓ Found {len(self.documents)} files ({sum(len(c) for c in self.documents.values()):,} chars)")
 
         # Step 2: Generate embeddings (with incremental updates)
-        await self._initialize_embeddings()
+        await self._initialize_embeddings(batch_mode=batch_mode)
 
-    async def _initialize_embeddings(self) -> None:
+    async def _initialize_embeddings(self, batch_mode: str = "sync") -> None:
         """Generate and store embeddings using per-file hashing (lazy loading).
 
         For each file:
         1. Check if file_hash matches what's in the database
         2. If hash matches: skip (embeddings already exist)
-        3. If hash differs or file is new: re-chunk, re-embed, store
+        3. If hash differs or file is new: re-chunk and store
+
+        Changed files are re-chunked, but only chunks whose content hash is
+        not already stored for that file are sent to the embedding API.
         """
         if not self.documents:
             print("⚠️ No documents to embed")
             self._initialized = True
             return
 
-        base_path_str = str(self.base_path.resolve())
+        base_path_str = self._base_path_str
 
         # Get existing file hashes from database
         existing_file_hashes = self.vector_store.get_file_hashes(base_path_str)
 
+        # Hash each file once; reused below when storing chunks
+        file_hashes = {
+            file_path: self._compute_file_hash(file_path)
+            for file_path in self.documents
+        }
+
         # Determine which files need embedding
         files_to_embed = []
         files_to_update = []
         files_unchanged = []
+        files_rehashed = []  # Unchanged, but stored under the legacy hash
 
-        for file_path in self.documents.keys():
-            current_hash = self._compute_file_hash(file_path)
+        for file_path, current_hash in file_hashes.items():
             existing_hash = existing_file_hashes.get(file_path)
 
             if existing_hash is None:
                 # New file - needs embedding
                 files_to_embed.append(file_path)
-            elif existing_hash != current_hash:
-                # File changed - needs re-embedding
-                files_to_update.append(file_path)
-            else:
+            elif existing_hash == current_hash:
                 # File unchanged - skip
                 files_unchanged.append(file_path)
+            elif existing_hash == self._compute_legacy_file_hash(file_path):
+                # File unchanged since it was stored with SHA256 - re-tag only
+                files_rehashed.append(file_path)
+                files_unchanged.append(file_path)
+            else:
+                # File changed - needs re-embedding
+                files_to_update.append(file_path)
+
+        for file_path in files_rehashed:
+            self.vector_store.update_file_hash(base_path_str, file_path, file_hashes[file_path])
 
         # Report status
         total_files = len(self.documents)
         if files_unchanged:
             print(f"✓ {len(files_unchanged)}/{total_files} files unchanged (reusing embeddings)")
+
+        if not files_to_embed and not files_to_update:
+            # All files up to date - no chunking and no embedding client needed
+            self._set_active_files()
+            return
+
         if files_to_embed:
             print(f"🔄 {len(files_to_embed)}/{total_files} new files to embed")
         if files_to_update:
@@ -227,140 +397,208 @@ class RAG:
         # Process files that need embedding/updating
         files_needing_work = files_to_embed + files_to_update
 
-        if not files_needing_work:
-            # All files up to date
-            self.active_file_paths = list(self.documents.keys())
-            self._initialized = True
-            return
-
-        # Delete old chunks for updated files
+        # Keep embeddings of unchanged chunks, then delete old chunks for updated files
+        reusable_embeddings: dict[str, dict[str, np.ndarray]] = {}
         for file_path in files_to_update:
+            reusable_embeddings[file_path] = self.vector_store.get_chunk_embeddings(
+                base_path_str, file_path
+            )
             deleted_count = self.vector_store.delete_file_chunks(base_path_str, file_path)
             print(f"  → Deleted {deleted_count} old chunks for {file_path}")
 
         # Chunk and embed files
-        embedding_service = await self._ensure_embedding_service()
-
         # Collect all chunks across files for batch processing
-        all_file_chunks = []  # List of (file_path, file_hash, chunks, metadatas)
+        # List of (file_path, file_hash, chunk_texts, chunk_metadatas, chunk_embeddings)
+        all_file_chunks: list[
+            tuple[str, str, list[str], list[dict[str, Any]], list[Optional[np.ndarray]]]
+        ] = []
 
-        for file_path in files_needing_work:
-            content = self.documents[file_path]
-            file_hash = self._compute_file_hash(file_path)
+        # Flattened chunks that still need an embedding, and where they belong
+        all_chunks = []
+        all_chunk_tokens = []  # Token count for each entry in all_chunks
+        chunk_positions = []  # (file_idx, chunk_idx_in_file) for each entry in all_chunks
+
+        chunks_per_file = await self._chunk_files(files_needing_work)
 
-            chunks = self.chunker.chunk_document(content, file_path)
+        for file_path, chunks in zip(files_needing_work, chunks_per_file, strict=True):
+            file_hash = file_hashes[file_path]
+            known_embeddings = reusable_embeddings.get(file_path, {})
 
             # Skip files with no chunks (too small or no content)
             if not chunks:
                 print(f"  → {file_path}: 0 chunks (skipping - file too small)")
                 continue
 
+            file_idx = len(all_file_chunks)
             chunk_texts = []
             chunk_metadatas = []
+            chunk_embeddings: list[Optional[np.ndarray]] = []
 
             for chunk in chunks:
+                chunk_hash = self._compute_chunk_hash(chunk.content)
                 chunk_texts.append(chunk.content)
                 chunk_metadatas.append({
                     "file_path": file_path,
                     "file_hash": file_hash,
+                    "chunk_hash": chunk_hash,
                     "chunk_index": chunk.chunk_index,
                     "token_count": chunk.token_count,
                     "start_char": chunk.start_char,
                     "end_char": chunk.end_char
                 })
 
-            all_file_chunks.append((file_path, file_hash, chunk_texts, chunk_metadatas))
-            print(f"  → {file_path}: {len(chunks)} chunks")
+                embedding = known_embeddings.get(chunk_hash)
+                if embedding is None:
+                    all_chunks.append(chunk.content)
+                    all_chunk_tokens.append(chunk.token_count)
+                    chunk_positions.append((file_idx, len(chunk_embeddings)))
+                chunk_embeddings.append(embedding)
+
+            all_file_chunks.append(
+                (file_path, file_hash, chunk_texts, chunk_metadatas, chunk_embeddings)
+            )
+            reused = len(chunks) - sum(1 for e in chunk_embeddings if e is None)
+            if reused:
+                print(f"  → {file_path}: {len(chunks)} chunks ({reused} unchanged)")
+            else:
+                print(f"  → {file_path}: {len(chunks)} chunks")
 
         # If no files have chunks, we're done
         if not all_file_chunks:
             print("  ⚠️ No files generated chunks (all files too small)")
-            self.active_file_paths = list(self.documents.keys())
-            self._initialized = True
+            self._set_active_files()
             return
 
-        # Flatten for batch embedding
-        all_chunks = []
-        chunk_to_file_map = []  # Track which file each chunk belongs to
-
-        for file_idx, (file_path, file_hash, chunk_texts, chunk_metadatas) in enumerate(all_file_chunks):
-            for chunk_text in chunk_texts:
-                all_chunks.append(chunk_text)
-                chunk_to_file_map.append(file_idx)
-
-        print(f"  → Total: {len(all_chunks)} chunks across {len(all_file_chunks)} files")
-
-        # Batch process embeddings with token-aware batching
-        max_batch_items = 128
-        max_batch_tokens = 60_000
-        all_embeddings = []
-
-        current_batch = []
-        current_batch_tokens = 0
-        batch_num = 0
-
-        for i, chunk in enumerate(all_chunks):
-            file_idx = chunk_to_file_map[i]
-            _, _, _, metadatas = all_file_chunks[file_idx]
-            # Find the chunk metadata for this chunk within its file
-            chunk_idx_in_file = sum(1 for j in range(i) if chunk_to_file_map[j] == file_idx)
-            chunk_tokens = metadatas[chunk_idx_in_file]["token_count"]
-
-            would_exceed_items = len(current_batch) >= max_batch_items
-            would_exceed_tokens = current_batch_tokens + chunk_tokens > max_batch_tokens
-
-            if current_batch and (would_exceed_items or would_exceed_tokens):
-                batch_num += 1
-                print(f"  → Batch {batch_num}: {len(current_batch)} chunks ({current_batch_tokens:,} tokens)...")
-                result = await embedding_service.embed_texts(current_batch, input_type="document")
-                all_embeddings.extend(result.embeddings)
-                print(f"  ✓ Batch {batch_num} complete")
-
-                import asyncio
-                await asyncio.sleep(3)
-
-                current_batch = [chunk]
-                current_batch_tokens = chunk_tokens
-            else:
-                current_batch.append(chunk)
-                current_batch_tokens += chunk_tokens
-
-        # Final batch
-        if current_batch:
-            batch_num += 1
-            print(f"  → Final batch {batch_num}: {len(current_batch)} chunks ({current_batch_tokens:,} tokens)...")
-            result = await embedding_service.embed_texts(current_batch, input_type="document")
-            all_embeddings.extend(result.embeddings)
-            print(f"  ✓ Final batch {batch_num} complete")
-
-        # Store embeddings per file
-        embedding_idx = 0
-        for file_path, file_hash, chunk_texts, chunk_metadatas in all_file_chunks:
-            file_embeddings = all_embeddings[embedding_idx:embedding_idx + len(chunk_texts)]
-
-            self.vector_store.store_file_chunks(
-                base_path=base_path_str,
-                file_path=file_path,
-                file_hash=file_hash,
-                chunks=chunk_texts,
-                embeddings=file_embeddings,
-                metadatas=chunk_metadatas
+        total_chunks = sum(len(texts) for _, _, texts, _, _ in all_file_chunks)
+        print(
+            f"  → Total: {total_chunks} chunks across {len(all_file_chunks)} files "
+            f"({len(all_chunks)} to embed)"
+        )
+
+        if not all_chunks:
+            all_embeddings = np.empty((0, 0), dtype=np.float32)
+        elif batch_mode == "voyage_batch":
+            embedding_service = await self._ensure_embedding_service()
+            print(f"  → Submitting {len(all_chunks)} chunks as a Voyage batch job...")
+            result = await embedding_service.embed_texts_batch(
+                all_chunks, input_type="document", output_dtype=self.quantization
+            )
+            print("  ✓ Batch job complete")
+            all_embeddings = result.embeddings
+        else:
+            embedding_service = await self._ensure_embedding_service()
+            all_embeddings = await self._embed_chunks_sync(
+                embedding_service, all_chunks, all_chunk_tokens
             )
 
-            embedding_idx += len(chunk_texts)
-            print(f"  ✓ Stored {len(chunk_texts)} chunks for {file_path}")
+        # Slot fresh embeddings in next to the reused ones (rows are views, not copies)
+        for (file_idx, chunk_idx_in_file), embedding in zip(
+            chunk_positions, all_embeddings, strict=True
+        ):
+            all_file_chunks[file_idx][4][chunk_idx_in_file] = embedding
+
+        # Store all files' chunks together (few large writes instead of one per file)
+        self.vector_store.bulk_store_file_chunks(
+            base_path_str,
+            [
+                # Every None slot was filled with a fresh embedding above
+                (file_path, file_hash, chunk_texts,
+                 cast(list[np.ndarray], chunk_embeddings), chunk_metadatas)
+                for file_path, file_hash, chunk_texts, chunk_metadatas, chunk_embeddings
+                in all_file_chunks
+            ]
+        )
+        print(f"  ✓ Stored {total_chunks} chunks for {len(all_file_chunks)} files")
 
         # Set active file paths for query filtering
+        self._set_active_files()
+        print(f"✓ RAG embeddings ready ({len(self.documents)} files, {total_chunks} total chunks)")
+
+    def _set_active_files(self) -> None:
+        """Mark all discovered files as searchable and finish initialization.
+
+        If the collection holds no other files (e.g. ones deleted from disk
+        since they were indexed), searches can skip the file_path filter.
+        The file index is saved once here, after all of this run's writes.
+        """
+        self.vector_store.save_file_index(self._base_path_str)
         self.active_file_paths = list(self.documents.keys())
+        stored_files = self.vector_store.get_file_hashes(self._base_path_str).keys()
+        self._needs_path_filter = not stored_files <= self.documents.keys()
         self._initialized = True
-        print(f"✓ RAG embeddings ready ({len(self.documents)} files, {len(all_chunks)} total chunks)")
 
-    async def search(self, query: str, top_k: Optional[int] = None) -> List[SearchResult]:
+    async def _chunk_files(self, file_paths: list[str]) -> list[List[Chunk]]:
+        """Chunk documents, using a process pool for larger file sets.
+
+        Args:
+            file_paths: Relative paths of documents to chunk
+
+        Returns:
+            List of chunks for each file, in the same order as file_paths
+        """
+        if len(file_paths) <= PARALLEL_CHUNKING_MIN_FILES:
+            return [
+                self.chunker.chunk_document(self.documents[file_path], file_path)
+                for file_path in file_paths
+            ]
+
+        loop = asyncio.get_running_loop()
+        # Spawned workers avoid forking a process that is running threads
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            return await asyncio.gather(*(
+                loop.run_in_executor(
+                    executor,
+                    _chunk_worker,
+                    self.documents[file_path],
+                    file_path,
+                    self.chunk_min_tokens,
+                    self.chunk_max_tokens,
+                )
+                for file_path in file_paths
+            ))
+
+    async def _embed_chunks_sync(
+        self,
+        embedding_service: VoyageEmbeddingService,
+        all_chunks: list[str],
+        all_chunk_tokens: list[int],
+    ) -> np.ndarray:
+        """Embed chunks via concurrent, token-aware requests to the embeddings endpoint.
+
+        Args:
+            embedding_service: Service to embed with
+            all_chunks: Chunk texts to embed
+            all_chunk_tokens: Token count of each chunk
+
+        Returns:
+            (len(all_chunks), dim) float32 array, rows in the same order as all_chunks
+        """
+        print(f"  → Embedding {len(all_chunks)} chunks...")
+        result = await embedding_service.embed_texts(
+            all_chunks,
+            input_type="document",
+            output_dtype=self.quantization,
+            token_counts=all_chunk_tokens,
+        )
+        print(f"  ✓ Embedding complete ({sum(all_chunk_tokens):,} tokens)")
+        return result.embeddings.astype(np.float32, copy=False)
+
+    async def search(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        restrict_to: list[str] | None = None
+    ) -> List[SearchResult]:
         """Search documents using semantic similarity.
 
         Args:
             query: Natural language search query
             top_k: Number of results to return (default: use instance default)
+            restrict_to: Optional relative file paths to search within
+                (default: all active files)
 
         Returns:
             List of SearchResult objects, sorted by relevance
@@ -380,27 +618,43 @@ class RAG:
         if not self.active_file_paths:
             return []
 
-        # Generate query embedding
+        # Generate query embedding (served from the embedding cache when repeated)
         embedding_service = await self._ensure_embedding_service()
         query_embedding = await embedding_service.embed_single(
             query,
-            input_type="query"
+            input_type="query",
+            output_dtype=self.quantization
         )
 
-        # Search vector store with file filtering
-        base_path_str = str(self.base_path.resolve())
+        # Search vector store, filtering by file only when the scope is narrower
+        # than the whole collection
+        base_path_str = self._base_path_str
         k = top_k if top_k is not None else self.top_k
 
+        if restrict_to is not None:
+            file_paths = restrict_to
+        elif self._needs_path_filter:
+            file_paths = self.active_file_paths
+        else:
+            file_paths = None
+
         results = self.vector_store.search(
             base_path=base_path_str,
             query_embedding=query_embedding,
-            file_paths=self.active_file_paths,
+            file_paths=file_paths,
             top_k=k
         )
 
         return results
 
+    def clear_embedding_cache(self) -> None:
+        """Remove all cached query and chunk embeddings."""
+        if self._embedding_cache is not None:
+            self._embedding_cache.clear()
+
     async def close(self):
-        """Clean up resources (close embedding service)."""
+        """Clean up resources (close embedding service and embedding cache)."""
         if self._embedding_service:
             await self._embedding_service.close()
+        if self._embedding_cache is not None:
+            self._embedding_cache.close()
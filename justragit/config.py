@@ -6,7 +6,8 @@ cli/rag/collections/ pattern.
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Literal
+
 import yaml
 
 
@@ -24,7 +25,7 @@ class CollectionConfig:
           - "docs/"
           - "**/*.md"
         blacklist_paths:
-          - "*/archive/"
+          - "**/archive/"
         chunk_min_tokens: 400
         chunk_max_tokens: 600
         top_k: 5
@@ -40,6 +41,10 @@ class CollectionConfig:
     top_k: int = 5
     respect_gitignore: bool = True
     max_file_size: int = 1_000_000  # 1MB
+    hnsw_search_ef: int = 100
+    quantization: Literal["float", "int8"] = "float"
+    max_concurrent_batches: int = 4
+    query_cache_size: int = 0  # 0 = off
 
     @classmethod
     def from_yaml(cls, path: str) -> 'CollectionConfig':
@@ -78,7 +83,11 @@ class CollectionConfig:
             chunk_max_tokens=data.get('chunk_max_tokens', 600),
             top_k=data.get('top_k', 5),
             respect_gitignore=data.get('respect_gitignore', True),
-            max_file_size=data.get('max_file_size', 1_000_000)
+            max_file_size=data.get('max_file_size', 1_000_000),
+            hnsw_search_ef=data.get('hnsw_search_ef', 100),
+            quantization=data.get('quantization', 'float'),
+            max_concurrent_batches=data.get('max_concurrent_batches', 4),
+            query_cache_size=data.get('query_cache_size', 0)
         )
 
     def to_yaml(self, path: str) -> None:
@@ -98,6 +107,10 @@ class CollectionConfig:
             'top_k': self.top_k,
             'respect_gitignore': self.respect_gitignore,
             'max_file_size': self.max_file_size,
+            'hnsw_search_ef': self.hnsw_search_ef,
+            'quantization': self.quantization,
+            'max_concurrent_batches': self.max_concurrent_batches,
+            'query_cache_size': self.query_cache_size,
         }
 
         with open(path, 'w') as f:
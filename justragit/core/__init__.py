@@ -5,12 +5,14 @@ This package contains the fundamental building blocks:
 - VoyageEmbeddingService: Embedding generation via Voyage AI
 - VectorStore: ChromaDB-based vector storage and retrieval
 - FileDiscovery: File discovery and loading with pattern matching
+- EmbeddingCache: Persistent on-disk cache of embedding vectors
 """
 
-from .chunker import DocumentChunker, Chunk
-from .embeddings import VoyageEmbeddingService, EmbeddingResult
-from .vector_store import VectorStore, SearchResult
+from .chunker import Chunk, DocumentChunker
+from .embedding_cache import EmbeddingCache
+from .embeddings import EmbeddingResult, VoyageEmbeddingService
 from .file_discovery import FileDiscovery
+from .vector_store import SearchResult, VectorStore
 
 __all__ = [
     "DocumentChunker",
@@ -20,4 +22,5 @@ __all__ = [
     "VectorStore",
     "SearchResult",
     "FileDiscovery",
+    "EmbeddingCache",
 ]
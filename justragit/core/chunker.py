@@ -7,11 +7,106 @@ This module provides intelligent document chunking that:
 4. Preserves semantic coherence
 """
 
+import hashlib
+import os
 import re
-from dataclasses import dataclass
-from typing import List
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
 import tiktoken
 
+# Extensions of files split on code structure instead of paragraphs
+_CODE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp',
+    '.h', '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt',
+    '.sh', '.sql'
+})
+
+# Positions just before a line break that starts a new top-level code
+# structure: Python def/class, JavaScript function/class, Java/C++ methods.
+# Zero-width, so splitting keeps the line break (segments tile the source).
+_CODE_BOUNDARY_RE = re.compile(
+    r'(?=\n(?:(?:async\s+)?(?:def|class|function)\s+\w+|(?:public|private|protected)\s+))'
+)
+
+# Positions just after a blank-line separator (zero-width, as above)
+_PARAGRAPH_BREAK_RE = re.compile(r'(?<=\n\n)')
+
+# Sentence terminator followed by newline, or by space and a capital letter.
+# Matches start at the terminator itself (no lookbehind), so one forward
+# finditer pass finds every break.
+_SENTENCE_END_RE = re.compile(r'[.!?](?:\n|\s+(?=[A-Z]))')
+
+# Documents longer than this many characters per target_max_tokens are
+# never small enough for a single chunk, so they skip the whole-document count
+_SMALL_DOC_MAX_CHARS_PER_TOKEN = 8
+
+# Chunk lists remembered per chunker, keyed by content digest (duplicate
+# files such as licenses and vendored code are only split once)
+CHUNK_CACHE_MAX_ENTRIES = 1024
+
+
+def _attach_blank_parts(parts: List[str]) -> List[str]:
+    """Merge whitespace-only parts into their neighbours.
+
+    Keeps the parts contiguous: joined, they still equal the original text.
+    """
+    merged: List[str] = []
+    leading = ""
+    for part in parts:
+        if not part.strip():
+            if merged:
+                merged[-1] += part
+            else:
+                leading += part
+        elif leading:
+            merged.append(leading + part)
+            leading = ""
+        else:
+            merged.append(part)
+    return merged
+
+
+def _assemble_chunks(
+    token_counts: List[int],
+    target_min_tokens: int,
+    hard_max_tokens: int
+) -> List[tuple[int, int, int]]:
+    """Group consecutive segments into chunks using only their token counts.
+
+    A chunk is closed before a segment that would push it over
+    hard_max_tokens, or once it has reached target_min_tokens.
+
+    Args:
+        token_counts: Token count of each segment, in order
+        target_min_tokens: Preferred minimum chunk size
+        hard_max_tokens: Absolute maximum chunk size
+
+    Returns:
+        (first_segment, end_segment, token_count) for each chunk, where
+        segments[first_segment:end_segment] make up the chunk
+    """
+    boundaries = []
+    start = 0
+    current_tokens = 0
+
+    for i, segment_tokens in enumerate(token_counts):
+        if i > start and (
+            current_tokens + segment_tokens > hard_max_tokens
+            or (current_tokens >= target_min_tokens and segment_tokens > 0)
+        ):
+            boundaries.append((start, i, current_tokens))
+            start = i
+            current_tokens = segment_tokens
+        else:
+            current_tokens += segment_tokens
+
+    if start < len(token_counts):
+        boundaries.append((start, len(token_counts), current_tokens))
+
+    return boundaries
+
 
 @dataclass
 class Chunk:
@@ -38,7 +133,8 @@ class DocumentChunker:
         target_min_tokens: int = 400,
         target_max_tokens: int = 600,
         hard_max_tokens: int = 1000,
-        encoding_name: str = "cl100k_base"  # GPT-4 tokenizer
+        encoding_name: str = "cl100k_base",  # GPT-4 tokenizer
+        num_threads: Optional[int] = None
     ):
         """Initialize chunker.
 
@@ -47,15 +143,29 @@ class DocumentChunker:
             target_max_tokens: Preferred maximum chunk size
             hard_max_tokens: Absolute maximum (force split if exceeded)
             encoding_name: Tokenizer to use for counting
+            num_threads: Threads for batch token counting (None = CPU count)
         """
         self.target_min_tokens = target_min_tokens
         self.target_max_tokens = target_max_tokens
         self.hard_max_tokens = hard_max_tokens
         self.encoding = tiktoken.get_encoding(encoding_name)
+        self.num_threads = num_threads or os.cpu_count() or 1
+
+        # content digest + splitting mode -> chunks, least recently used first
+        self._chunk_cache: OrderedDict[str, List[Chunk]] = OrderedDict()
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in text."""
-        return len(self.encoding.encode(text))
+        return len(self.encoding.encode_ordinary(text))
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens in many texts at once (encoded in parallel threads)."""
+        if not texts:
+            return []
+        return [
+            len(ids)
+            for ids in self.encoding.encode_ordinary_batch(texts, num_threads=self.num_threads)
+        ]
 
     def chunk_document(self, content: str, file_path: str = "") -> List[Chunk]:
         """Chunk a document into semantically coherent pieces.
@@ -64,66 +174,64 @@ class DocumentChunker:
             content: Document text content
             file_path: Optional file path for better splitting heuristics
 
+        Identical content is only split once: results are cached by a
+        BLAKE2b digest of the content (and whether it is split as code).
+
         Returns:
             List of Chunk objects
         """
-        # Detect content type
-        is_code = self._is_code_file(file_path)
+        if not content.strip():
+            return []
 
-        # Split into initial segments
+        is_code = self._is_code_file(file_path)
+        key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        key += ':code' if is_code else ':text'
+
+        cached = self._chunk_cache.get(key)
+        if cached is not None:
+            self._chunk_cache.move_to_end(key)
+            return [replace(chunk) for chunk in cached]
+
+        chunks = self._chunk_uncached(content, is_code)
+
+        self._chunk_cache[key] = chunks
+        if len(self._chunk_cache) > CHUNK_CACHE_MAX_ENTRIES:
+            self._chunk_cache.popitem(last=False)
+        # Callers get their own Chunk objects, so changing one (e.g.
+        # renumbering chunk_index) cannot alter the cached copies
+        return [replace(chunk) for chunk in chunks]
+
+    def _chunk_uncached(self, content: str, is_code: bool) -> List[Chunk]:
+        """Split a non-blank document into chunks (see chunk_document)."""
+        # Small documents become a single chunk without any splitting
+        if len(content) <= self.target_max_tokens * _SMALL_DOC_MAX_CHARS_PER_TOKEN:
+            total_tokens = self.count_tokens(content)
+            if total_tokens <= self.target_max_tokens:
+                return [self._finalize_chunk(content, 0, len(content), total_tokens, 0)]
+
+        # Split into initial segments (token counts come with them; chunk
+        # sizes are kept as running sums)
         if is_code:
-            segments = self._split_code(content)
+            segments, segment_token_counts = self._split_code(content)
         else:
-            segments = self._split_text(content)
-
-        # Build chunks from segments
-        chunks = []
-        current_chunk = ""
-        current_start = 0
-        chunk_index = 0
-
-        for segment in segments:
-            segment_tokens = self.count_tokens(segment)
-            current_tokens = self.count_tokens(current_chunk)
-            combined_tokens = self.count_tokens(current_chunk + segment)
-
-            # If adding this segment exceeds hard max, finalize current chunk
-            if current_chunk and combined_tokens > self.hard_max_tokens:
-                chunk = self._finalize_chunk(
-                    current_chunk,
-                    current_start,
-                    current_start + len(current_chunk),
-                    chunk_index
-                )
-                chunks.append(chunk)
-                chunk_index += 1
-                current_chunk = segment
-                current_start += len(current_chunk)
-            # If current chunk is in target range, finalize it
-            elif current_tokens >= self.target_min_tokens and segment_tokens > 0:
-                chunk = self._finalize_chunk(
-                    current_chunk,
-                    current_start,
-                    current_start + len(current_chunk),
-                    chunk_index
-                )
-                chunks.append(chunk)
-                chunk_index += 1
-                current_chunk = segment
-                current_start += len(chunk.content)
-            # Otherwise, accumulate
-            else:
-                current_chunk += segment
-
-        # Finalize remaining chunk
-        if current_chunk.strip():
-            chunk = self._finalize_chunk(
-                current_chunk,
-                current_start,
-                current_start + len(current_chunk),
-                chunk_index
-            )
-            chunks.append(chunk)
+            segments, segment_token_counts = self._split_text(content)
+
+        # Decide chunk boundaries from token counts, then build each chunk once
+        chunks: List[Chunk] = []
+        offset = 0
+        for first, end, token_count in _assemble_chunks(
+            segment_token_counts, self.target_min_tokens, self.hard_max_tokens
+        ):
+            chunk_text = "".join(segments[first:end])
+            if chunk_text.strip():
+                chunks.append(self._finalize_chunk(
+                    chunk_text,
+                    offset,
+                    offset + len(chunk_text),
+                    token_count,
+                    len(chunks)
+                ))
+            offset += len(chunk_text)
 
         return chunks
 
@@ -132,6 +240,7 @@ class DocumentChunker:
         content: str,
         start_char: int,
         end_char: int,
+        token_count: int,
         chunk_index: int
     ) -> Chunk:
         """Create a Chunk object with metadata."""
@@ -139,105 +248,134 @@ class DocumentChunker:
             content=content.strip(),
             start_char=start_char,
             end_char=end_char,
-            token_count=self.count_tokens(content),
+            token_count=token_count,
             chunk_index=chunk_index
         )
 
     def _is_code_file(self, file_path: str) -> bool:
         """Detect if file is code based on extension."""
-        code_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp',
-            '.h', '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt',
-            '.sh', '.sql'
-        }
-        return any(file_path.endswith(ext) for ext in code_extensions)
-
-    def _split_code(self, content: str) -> List[str]:
+        dot = file_path.rfind('.')
+        return dot >= 0 and file_path[dot:].lower() in _CODE_EXTENSIONS
+
+    def _split_code(self, content: str) -> tuple[List[str], List[int]]:
         """Split code on function/class boundaries.
 
         Strategy:
         1. Split on function/class definitions
         2. Keep docstrings with functions
         3. Preserve indentation context
-        """
-        segments = []
-
-        # Regex patterns for common code structures
-        # Python: def/class, JavaScript: function/class, etc.
-        patterns = [
-            r'\n(?=(?:async\s+)?(?:def|class)\s+\w+)',  # Python
-            r'\n(?=(?:async\s+)?function\s+\w+)',  # JavaScript function
-            r'\n(?=class\s+\w+)',  # JavaScript/Java class
-            r'\n(?=(?:public|private|protected)\s+)',  # Java/C++ methods
-        ]
 
-        # Try each pattern
-        for pattern in patterns:
-            parts = re.split(pattern, content)
-            if len(parts) > 1:
-                # Found good splits, use them
-                segments = [p for p in parts if p.strip()]
-                break
+        Returns:
+            (segments, token count of each segment)
+        """
+        # Split on every code structure boundary in a single pass. Segments
+        # are slices of content (separators included) that tile the whole
+        # document, so chunk offsets stay exact.
+        segments = _attach_blank_parts(_CODE_BOUNDARY_RE.split(content))
 
         # Fallback: split on double newlines (paragraph-like)
-        if not segments:
-            segments = [s.strip() + '\n\n' for s in content.split('\n\n') if s.strip()]
+        if len(segments) <= 1:
+            segments = _attach_blank_parts(_PARAGRAPH_BREAK_RE.split(content))
 
         # If segments are still too large, split further
-        refined_segments = []
-        for segment in segments:
-            if self.count_tokens(segment) > self.hard_max_tokens:
+        segment_tokens = self.count_tokens_batch(segments)
+        refined_segments: List[str] = []
+        refined_tokens: List[int] = []
+        split_positions: List[int] = []  # Index in refined_segments of each newline-split piece
+        for segment, tokens in zip(segments, segment_tokens, strict=True):
+            if tokens > self.hard_max_tokens:
                 # Split on single newlines
-                subsegments = [s + '\n' for s in segment.split('\n') if s.strip()]
+                subsegments = _attach_blank_parts(segment.splitlines(keepends=True))
+                split_positions.extend(
+                    range(len(refined_segments), len(refined_segments) + len(subsegments))
+                )
                 refined_segments.extend(subsegments)
+                refined_tokens.extend([0] * len(subsegments))
             else:
                 refined_segments.append(segment)
+                refined_tokens.append(tokens)
 
-        return refined_segments if refined_segments else [content]
+        # Count all newline-split pieces in one batch
+        split_tokens = self.count_tokens_batch([refined_segments[i] for i in split_positions])
+        for i, tokens in zip(split_positions, split_tokens, strict=True):
+            refined_tokens[i] = tokens
 
-    def _split_text(self, content: str) -> List[str]:
+        if not refined_segments:
+            return [content], [self.count_tokens(content)]
+        return refined_segments, refined_tokens
+
+    def _split_text(self, content: str) -> tuple[List[str], List[int]]:
         """Split natural language text on sentence/paragraph boundaries.
 
         Strategy:
         1. Split on paragraphs (double newlines)
         2. If too large, split on sentences
         3. If still too large, split on words
-        """
-        # First, split on paragraphs
-        paragraphs = [p.strip() + '\n\n' for p in content.split('\n\n') if p.strip()]
-
-        segments = []
-        for para in paragraphs:
-            para_tokens = self.count_tokens(para)
 
+        Returns:
+            (segments, token count of each segment)
+        """
+        # First, split on paragraphs in one scan. Each paragraph is a slice
+        # of content running up to the next one (separator included), so
+        # segments tile the document and chunk offsets stay exact.
+        spans: List[List[int]] = []
+        start = 0
+        while start < len(content):
+            end = content.find('\n\n', start)
+            end = len(content) if end == -1 else end + 2
+            if spans and not content[start:end].strip():
+                spans[-1][1] = end  # Blank run: attach to the previous paragraph
+            else:
+                spans.append([start, end])
+            start = end
+        paragraphs = [content[start:end] for start, end in spans]
+        paragraph_tokens = self.count_tokens_batch(paragraphs)
+
+        segments: List[str] = []
+        segment_tokens: List[int] = []
+        split_positions: List[int] = []  # Index in segments of each sentence-split piece
+        for para, para_tokens in zip(paragraphs, paragraph_tokens, strict=True):
             # If paragraph is in target range, keep it
             if para_tokens <= self.target_max_tokens:
                 segments.append(para)
+                segment_tokens.append(para_tokens)
             # If too large, split on sentences
             elif para_tokens > self.hard_max_tokens:
                 sentences = self._split_sentences(para)
+                split_positions.extend(range(len(segments), len(segments) + len(sentences)))
                 segments.extend(sentences)
+                segment_tokens.extend([0] * len(sentences))
             else:
                 # Close to max but not over hard limit
                 segments.append(para)
+                segment_tokens.append(para_tokens)
 
-        return segments if segments else [content]
+        # Count all sentences in one batch
+        sentence_tokens = self.count_tokens_batch([segments[i] for i in split_positions])
+        for i, tokens in zip(split_positions, sentence_tokens, strict=True):
+            segment_tokens[i] = tokens
+
+        if not segments:
+            return [content], [self.count_tokens(content)]
+        return segments, segment_tokens
 
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences.
 
-        Uses simple heuristics for sentence boundaries.
+        Uses simple heuristics for sentence boundaries. Sentences are
+        slices of text that keep their trailing whitespace, so joining
+        them gives back the original text.
         """
-        # Split on sentence terminators followed by space and capital letter
-        # or newline
-        pattern = r'(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])\n'
-        sentences = re.split(pattern, text)
-
-        # Clean up and add spacing
-        result = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence:
-                result.append(sentence + ' ')
-
-        return result if result else [text]
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(text):
+            sentences.append(text[start:match.end()])
+            start = match.end()
+
+        tail = text[start:]
+        if tail.strip() or not sentences:
+            sentences.append(tail)
+        elif tail:
+            sentences[-1] += tail  # Trailing whitespace belongs to the last sentence
+
+        return sentences
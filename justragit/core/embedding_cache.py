@@ -0,0 +1,165 @@
+"""Persistent embedding cache for RAG.
+
+This module provides a small SQLite-backed cache that maps
+(model, input_type, output_dtype, text) to an embedding vector, so
+repeated texts (re-typed search queries, unchanged or duplicated chunks)
+skip the embedding API.
+"""
+
+import hashlib
+import sqlite3
+import time
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Keys per SELECT ... IN (...) query (SQLite's default variable limit is 999)
+_MAX_SQL_PARAMS = 900
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU cache of embedding vectors.
+
+    Vectors are stored as float16 bytes (half the size of float32) and
+    the least recently used entries are evicted once max_entries is
+    exceeded.
+
+    Example:
+        >>> cache = EmbeddingCache("data/chromadb/embedding_cache.sqlite3")
+        >>> key = cache.make_key("voyage-3-large", "query", "auth")
+        >>> if (embedding := cache.get(key)) is None:
+        ...     embedding = await service.embed_single("auth", input_type="query")
+        ...     cache.set(key, embedding)
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 10_000):
+        """Initialize embedding cache.
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+            max_entries: Maximum number of cached vectors
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at INTEGER NOT NULL)"
+        )
+        # Eviction scans entries oldest-first
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_accessed_at ON embeddings (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, input_type: str, text: str, output_dtype: str = "float") -> str:
+        """Build the cache key for a text.
+
+        Args:
+            model: Embedding model name
+            input_type: Type of input ("document" or "query")
+            text: Text being embedded
+            output_dtype: Embedding data type ("float" or "int8")
+
+        Returns:
+            SHA256 hex string (64 characters)
+        """
+        return hashlib.sha256(
+            f"{model}|{input_type}|{output_dtype}|{text}".encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[list[float]]:
+        """Look up a cached embedding.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Embedding vector, or None on a cache miss
+        """
+        vector = self.get_many([key])[0]
+        return None if vector is None else vector.tolist()
+
+    def get_many(self, keys: Sequence[str]) -> list[Optional[np.ndarray]]:
+        """Look up many cached embeddings at once.
+
+        Args:
+            keys: Cache keys from make_key()
+
+        Returns:
+            float32 vector (or None on a miss) for each key, in order
+        """
+        found: dict[str, bytes] = {}
+        now = time.time_ns()
+        # Read and refresh access times in one transaction (one commit per call)
+        with self._conn:
+            for start in range(0, len(keys), _MAX_SQL_PARAMS):
+                batch = list(keys[start:start + _MAX_SQL_PARAMS])
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                if rows:
+                    found.update(rows)
+                    hits = [key for key, _ in rows]
+                    self._conn.execute(
+                        f"UPDATE embeddings SET accessed_at = ? "
+                        f"WHERE key IN ({','.join('?' * len(hits))})",
+                        [now, *hits]
+                    )
+
+        return [
+            np.frombuffer(found[key], dtype=np.float16).astype(np.float32)
+            if key in found else None
+            for key in keys
+        ]
+
+    def set(self, key: str, embedding: list[float]) -> None:
+        """Store an embedding, evicting least recently used entries if full.
+
+        Args:
+            key: Cache key from make_key()
+            embedding: Embedding vector
+        """
+        self.set_many([(key, embedding)])
+
+    def set_many(self, items: Iterable[tuple[str, Sequence[float]]]) -> None:
+        """Store many embeddings, evicting least recently used entries if full.
+
+        Args:
+            items: (key, embedding vector) pairs
+        """
+        now = time.time_ns()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+            [
+                (key, np.asarray(embedding, dtype=np.float16).tobytes(), now)
+                for key, embedding in items
+            ]
+        )
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                "SELECT key FROM embeddings ORDER BY accessed_at LIMIT ?)",
+                (excess,)
+            )
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached embeddings."""
+        self._conn.execute("DELETE FROM embeddings")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        count: int = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return count
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
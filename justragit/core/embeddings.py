@@ -3,16 +3,97 @@
 This module provides embedding generation using Voyage AI's voyage-3-large model.
 """
 
+import asyncio
+import json
 import os
-from typing import List, Optional
-import httpx
+import random
+from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+
+import httpx
+import numpy as np
+
+from .embedding_cache import EmbeddingCache
+
+# Optional: orjson parses large embedding responses several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+# Embedding data types requested from the Voyage API
+SUPPORTED_OUTPUT_DTYPES = ("float", "int8")
+
+# numpy dtypes that float embeddings can be held in
+SUPPORTED_FLOAT_DTYPES = ("float32", "float16")
+
+# Voyage Batch API limit on inputs per batch job
+MAX_BATCH_JOB_INPUTS = 100_000
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Conservative characters-per-token ratio for sizing requests when the
+# caller does not pass token counts
+_CHARS_PER_TOKEN_ESTIMATE = 3
+
+
+def _json_loads(data: bytes | str) -> Any:
+    """Parse JSON with orjson when installed, else the standard library."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pack_batches(
+    token_counts: Sequence[int],
+    max_items: int = 128,
+    max_tokens: int = 60_000
+) -> List[slice]:
+    """Greedily pack consecutive texts into request-sized batches.
+
+    Each batch holds at most max_items texts and max_tokens tokens. A
+    single text larger than max_tokens gets a batch of its own.
+
+    Args:
+        token_counts: Token count of each text, in order
+        max_items: Maximum texts per batch
+        max_tokens: Maximum total tokens per batch
+
+    Returns:
+        List of slices into the original sequence, covering it in order
+
+    Example:
+        >>> pack_batches([50, 50, 50], max_items=128, max_tokens=100)
+        [slice(0, 2, None), slice(2, 3, None)]
+    """
+    n = len(token_counts)
+    cumulative = np.cumsum(np.asarray(token_counts, dtype=np.int64))
+
+    batches = []
+    start = 0
+    while start < n:
+        consumed = int(cumulative[start - 1]) if start else 0
+        # First index whose running total would exceed the token budget
+        end = int(np.searchsorted(cumulative, consumed + max_tokens, side="right"))
+        end = min(max(end, start + 1), start + max_items, n)
+        batches.append(slice(start, end))
+        start = end
+
+    return batches
 
 
 @dataclass
 class EmbeddingResult:
-    """Result from embedding generation."""
-    embeddings: List[List[float]]
+    """Result from embedding generation.
+
+    embeddings is an (n, dim) array: float32 (or the service's configured
+    float dtype), or int8 when requested with output_dtype="int8".
+    """
+    embeddings: np.ndarray
     model: str
     total_tokens: int
 
@@ -27,7 +108,13 @@ class VoyageEmbeddingService:
         self,
         api_key: Optional[str] = None,
         model: str = "voyage-3-large",
-        base_url: str = "https://api.voyageai.com/v1"
+        base_url: str = "https://api.voyageai.com/v1",
+        max_retries: int = 4,
+        max_texts_per_request: int = 128,
+        max_tokens_per_request: int = 120_000,
+        max_parallel: int = 8,
+        cache: Optional[EmbeddingCache | str | Path] = None,
+        dtype: str = "float32"
     ):
         """Initialize Voyage AI embedding service.
 
@@ -35,6 +122,17 @@ class VoyageEmbeddingService:
             api_key: Voyage AI API key (defaults to VOYAGE_API_KEY env var)
             model: Model to use for embeddings
             base_url: API base URL
+            max_retries: Times to retry a request rejected with 429 (rate limit)
+                or a transient 5xx error, with exponential backoff
+            max_texts_per_request: Maximum texts sent in one embeddings request
+            max_tokens_per_request: Maximum total tokens sent in one embeddings request
+            max_parallel: Maximum embeddings requests in flight at once
+            cache: EmbeddingCache (or path to its SQLite file) consulted before
+                calling the API; texts already embedded with the same model,
+                input_type and output_dtype are not sent again
+            dtype: numpy dtype for float embeddings ("float32" or "float16").
+                "float16" halves memory for large jobs at ~3 significant digits
+                of precision; int8 embeddings always stay int8.
         """
         self.api_key = api_key or os.getenv("VOYAGE_API_KEY")
         if not self.api_key:
@@ -43,38 +141,180 @@ class VoyageEmbeddingService:
                 "or pass api_key parameter."
             )
 
+        if dtype not in SUPPORTED_FLOAT_DTYPES:
+            raise ValueError(
+                f"Unsupported dtype: {dtype}. "
+                f"Expected one of: {', '.join(SUPPORTED_FLOAT_DTYPES)}"
+            )
+
         self.model = model
         self.base_url = base_url
+        self.max_retries = max_retries
+        self.dtype = dtype
+        self.max_texts_per_request = max_texts_per_request
+        self.max_tokens_per_request = max_tokens_per_request
+        self.max_parallel = max_parallel
+        # Close the cache on close() only if we opened it
+        self._owns_cache = isinstance(cache, (str, Path))
+        if isinstance(cache, (str, Path)):
+            cache = EmbeddingCache(cache)
+        self.cache: Optional[EmbeddingCache] = cache
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(60.0),
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            # Retries failed connection attempts; HTTP errors are retried below
+            transport=httpx.AsyncHTTPTransport(retries=3),
+            # Content-Type is set per request (JSON bodies and file uploads)
+            headers={"Authorization": f"Bearer {self.api_key}"}
         )
 
     async def embed_texts(
         self,
         texts: List[str],
-        input_type: str = "document"
+        input_type: str = "document",
+        output_dtype: str = "float",
+        token_counts: Optional[Sequence[int]] = None
     ) -> EmbeddingResult:
         """Generate embeddings for multiple texts.
 
+        Texts found in the cache are not sent. The rest are packed into
+        requests of at most max_texts_per_request texts and
+        max_tokens_per_request tokens, sent concurrently (at most
+        max_parallel at once).
+
         Args:
             texts: List of texts to embed
             input_type: Type of input ("document" or "query")
                 - "document": For indexing documents
                 - "query": For search queries
+            output_dtype: Embedding data type ("float" or "int8")
+                - "int8": Scalar-quantized embeddings (values in -128..127),
+                  4x smaller on the wire
+            token_counts: Token count of each text, used to size requests
+                (default: estimated from text length)
 
         Returns:
-            EmbeddingResult with embeddings and metadata
+            EmbeddingResult with embeddings in the same order as texts
 
         Raises:
-            httpx.HTTPError: If API request fails
+            RuntimeError: If an API request fails
         """
         if not texts:
             raise ValueError("Cannot embed empty text list")
+        if output_dtype not in SUPPORTED_OUTPUT_DTYPES:
+            raise ValueError(
+                f"Unsupported output_dtype: {output_dtype}. "
+                f"Expected one of: {', '.join(SUPPORTED_OUTPUT_DTYPES)}"
+            )
 
+        if token_counts is None:
+            token_counts = [len(text) // _CHARS_PER_TOKEN_ESTIMATE + 1 for text in texts]
+
+        return await self._embed_with_cache(
+            texts,
+            input_type,
+            output_dtype,
+            lambda misses: self._embed_uncached(
+                [texts[i] for i in misses],
+                input_type,
+                output_dtype,
+                [token_counts[i] for i in misses]
+            )
+        )
+
+    async def _embed_with_cache(
+        self,
+        texts: List[str],
+        input_type: str,
+        output_dtype: str,
+        embed_misses: Callable[[List[int]], Awaitable[EmbeddingResult]]
+    ) -> EmbeddingResult:
+        """Serve texts from the cache, embedding only the rest.
+
+        Args:
+            texts: Texts to embed
+            input_type: Type of input ("document" or "query")
+            output_dtype: Embedding data type ("float" or "int8")
+            embed_misses: Embeds the texts at the given indices, in order
+
+        Returns:
+            EmbeddingResult with embeddings in the same order as texts
+        """
+        if self.cache is None:
+            return await embed_misses(list(range(len(texts))))
+
+        keys = [
+            EmbeddingCache.make_key(self.model, input_type, text, output_dtype)
+            for text in texts
+        ]
+        cached = self.cache.get_many(keys)
+        misses = [i for i, vector in enumerate(cached) if vector is None]
+        dtype = self._numpy_dtype(output_dtype)
+
+        if not misses:
+            return EmbeddingResult(
+                embeddings=np.array(cached, dtype=dtype), model=self.model, total_tokens=0
+            )
+
+        result = await embed_misses(misses)
+        self.cache.set_many(zip((keys[i] for i in misses), result.embeddings, strict=True))
+        if len(misses) == len(texts):
+            return result
+
+        embeddings = np.empty((len(texts), result.embeddings.shape[1]), dtype=dtype)
+        for i, vector in enumerate(cached):
+            if vector is not None:
+                embeddings[i] = vector
+        embeddings[misses] = result.embeddings
+
+        return EmbeddingResult(
+            embeddings=embeddings, model=result.model, total_tokens=result.total_tokens
+        )
+
+    async def _embed_uncached(
+        self,
+        texts: List[str],
+        input_type: str,
+        output_dtype: str,
+        token_counts: Sequence[int]
+    ) -> EmbeddingResult:
+        """Embed texts via concurrent, size-limited requests (see embed_texts)."""
+        shards = pack_batches(
+            token_counts, self.max_texts_per_request, self.max_tokens_per_request
+        )
+        if len(shards) == 1:
+            return await self._embed_shard(texts, input_type, output_dtype)
+
+        # Allocated once the first response tells us the dimension;
+        # each shard then writes its rows straight into its slice
+        embeddings: Optional[np.ndarray] = None
+        total_tokens = 0
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def embed_into(shard: slice) -> None:
+            nonlocal embeddings, total_tokens
+            async with semaphore:
+                result = await self._embed_shard(texts[shard], input_type, output_dtype)
+            if embeddings is None:
+                embeddings = np.empty(
+                    (len(texts), result.embeddings.shape[1]), dtype=result.embeddings.dtype
+                )
+            embeddings[shard] = result.embeddings
+            total_tokens += result.total_tokens
+
+        await asyncio.gather(*(embed_into(shard) for shard in shards))
+
+        if embeddings is None:
+            # Unreachable: texts is non-empty, so there is at least one shard
+            raise RuntimeError("No embeddings were returned")
+        return EmbeddingResult(embeddings=embeddings, model=self.model, total_tokens=total_tokens)
+
+    async def _embed_shard(
+        self,
+        texts: List[str],
+        input_type: str,
+        output_dtype: str
+    ) -> EmbeddingResult:
+        """Embed texts with a single embeddings request (retrying transient errors)."""
         # Voyage AI API endpoint
         url = f"{self.base_url}/embeddings"
 
@@ -83,14 +323,19 @@ class VoyageEmbeddingService:
             "model": self.model,
             "input_type": input_type
         }
+        if output_dtype != "float":
+            payload["output_dtype"] = output_dtype
 
         try:
-            response = await self.client.post(url, json=payload)
+            response = await self._send_with_retries("POST", url, json=payload)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
 
-            # Extract embeddings in order
-            embeddings = [item["embedding"] for item in data["data"]]
+            # Extract embeddings in order, as one contiguous (n, dim) array
+            embeddings = np.array(
+                [item["embedding"] for item in data["data"]],
+                dtype=self._numpy_dtype(output_dtype)
+            )
 
             return EmbeddingResult(
                 embeddings=embeddings,
@@ -111,26 +356,253 @@ class VoyageEmbeddingService:
         except httpx.HTTPError as e:
             raise RuntimeError(f"Failed to generate embeddings: {e}") from e
 
+    async def embed_texts_batch(
+        self,
+        texts: List[str],
+        input_type: str = "document",
+        output_dtype: str = "float",
+        poll_interval: float = 60.0
+    ) -> EmbeddingResult:
+        """Generate embeddings for many texts via the Voyage Batch API.
+
+        Cheaper than embed_texts() for large one-off indexing jobs, but
+        asynchronous on Voyage's side: this waits (polling every
+        poll_interval seconds) until every batch job has completed.
+        Texts found in the cache are not submitted.
+
+        Args:
+            texts: List of texts to embed
+            input_type: Type of input ("document" or "query")
+            output_dtype: Embedding data type ("float" or "int8")
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            EmbeddingResult with embeddings in the same order as texts
+
+        Raises:
+            RuntimeError: If a batch job fails or an API request fails
+        """
+        if not texts:
+            raise ValueError("Cannot embed empty text list")
+        if output_dtype not in SUPPORTED_OUTPUT_DTYPES:
+            raise ValueError(
+                f"Unsupported output_dtype: {output_dtype}. "
+                f"Expected one of: {', '.join(SUPPORTED_OUTPUT_DTYPES)}"
+            )
+
+        async def embed_misses(misses: List[int]) -> EmbeddingResult:
+            miss_texts = [texts[i] for i in misses]
+            job_embeddings = []
+            for start in range(0, len(miss_texts), MAX_BATCH_JOB_INPUTS):
+                job_texts = miss_texts[start:start + MAX_BATCH_JOB_INPUTS]
+                batch_id = await self.submit_batch(job_texts, input_type, output_dtype)
+                batch = await self.wait_for_batch(batch_id, poll_interval=poll_interval)
+                job_embeddings.append(np.array(
+                    await self.fetch_batch_results(batch, len(job_texts)),
+                    dtype=self._numpy_dtype(output_dtype)
+                ))
+            embeddings = (
+                job_embeddings[0] if len(job_embeddings) == 1 else np.concatenate(job_embeddings)
+            )
+            # The Batch API does not report per-request usage
+            return EmbeddingResult(embeddings=embeddings, model=self.model, total_tokens=0)
+
+        return await self._embed_with_cache(texts, input_type, output_dtype, embed_misses)
+
+    async def submit_batch(
+        self,
+        texts: List[str],
+        input_type: str = "document",
+        output_dtype: str = "float"
+    ) -> str:
+        """Upload texts and start a Voyage Batch API embedding job.
+
+        Args:
+            texts: Texts to embed (at most 100K per job)
+            input_type: Type of input ("document" or "query")
+            output_dtype: Embedding data type ("float" or "int8")
+
+        Returns:
+            Batch job ID
+        """
+        if len(texts) > MAX_BATCH_JOB_INPUTS:
+            raise ValueError(
+                f"A batch job accepts at most {MAX_BATCH_JOB_INPUTS:,} inputs, got {len(texts):,}"
+            )
+
+        # One request per line; custom_id maps results back to input order
+        lines = [
+            json.dumps({"custom_id": f"chunk-{i}", "body": {"input": [text]}})
+            for i, text in enumerate(texts)
+        ]
+        input_file = ("\n".join(lines) + "\n").encode('utf-8')
+
+        upload = await self._request(
+            "POST",
+            f"{self.base_url}/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch_input.jsonl", input_file, "application/jsonl")}
+        )
+
+        request_params: dict[str, Any] = {"model": self.model, "input_type": input_type}
+        if output_dtype != "float":
+            request_params["output_dtype"] = output_dtype
+
+        batch = await self._request(
+            "POST",
+            f"{self.base_url}/batches",
+            json={
+                "endpoint": "/v1/embeddings",
+                "completion_window": "12h",
+                "request_params": request_params,
+                "input_file_id": upload.json()["id"]
+            }
+        )
+        batch_id: str = batch.json()["id"]
+        return batch_id
+
+    async def wait_for_batch(self, batch_id: str, poll_interval: float = 60.0) -> dict[str, Any]:
+        """Poll a batch job until it completes.
+
+        Args:
+            batch_id: Batch job ID from submit_batch()
+            poll_interval: Seconds between status checks
+
+        Returns:
+            The completed batch object
+
+        Raises:
+            RuntimeError: If the job fails, expires, or is cancelled
+        """
+        while True:
+            response = await self._request("GET", f"{self.base_url}/batches/{batch_id}")
+            batch: dict[str, Any] = response.json()
+            status = batch.get("status")
+
+            if status == "completed":
+                return batch
+            if status in ("failed", "expired", "cancelled", "cancelling"):
+                raise RuntimeError(f"Voyage batch {batch_id} did not complete: {status}")
+
+            await asyncio.sleep(poll_interval)
+
+    async def fetch_batch_results(self, batch: dict[str, Any], num_texts: int) -> List[List[float]]:
+        """Download the output of a completed batch job.
+
+        Args:
+            batch: Completed batch object from wait_for_batch()
+            num_texts: Number of texts submitted in the job
+
+        Returns:
+            Embeddings in submission order
+
+        Raises:
+            RuntimeError: If any request in the job failed
+        """
+        response = await self._request(
+            "GET", f"{self.base_url}/files/{batch['output_file_id']}/content"
+        )
+
+        embeddings: List[Optional[List[float]]] = [None] * num_texts
+        for line in response.text.splitlines():
+            if not line.strip():
+                continue
+            record = _json_loads(line)
+            result = record.get("response") or {}
+            body = result.get("body", result)
+            if "data" not in body:
+                raise RuntimeError(
+                    f"Voyage batch request {record.get('custom_id')} failed: "
+                    f"{record.get('error') or body}"
+                )
+            index = int(record["custom_id"].rsplit("-", 1)[1])
+            embeddings[index] = body["data"][0]["embedding"]
+
+        missing = sum(1 for embedding in embeddings if embedding is None)
+        if missing:
+            raise RuntimeError(f"Voyage batch output is missing {missing} embeddings")
+
+        return embeddings  # type: ignore[return-value]
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request to the Voyage API, converting errors to RuntimeError.
+
+        GET requests are retried on transient errors; other methods (which
+        create files or jobs) are sent once.
+        """
+        try:
+            if method == "GET":
+                response = await self._send_with_retries(method, url, **kwargs)
+            else:
+                response = await self.client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError(
+                f"Voyage AI API error: {e.response.status_code} - {e.response.text}"
+            ) from e
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Voyage AI request failed: {e}") from e
+
+    def _numpy_dtype(self, output_dtype: str) -> np.dtype:
+        """numpy dtype to hold embeddings fetched with output_dtype."""
+        return np.dtype(np.int8 if output_dtype == "int8" else self.dtype)
+
+    async def _send_with_retries(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying up to max_retries times on 429 and 5xx responses.
+
+        Returns:
+            The last response (the caller checks its status)
+        """
+        for attempt in range(self.max_retries + 1):
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                return response
+            # Rate limited or server hiccup - wait, then retry
+            await asyncio.sleep(self._retry_delay(response, attempt))
+        return response
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a failed request.
+
+        Uses the Retry-After header when present, otherwise exponential
+        backoff (1s, 2s, 4s, ...) plus up to 1s of random jitter, so
+        concurrent requests do not retry in lockstep.
+        """
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return 2.0 ** attempt + random.random()
+
     async def embed_single(
         self,
         text: str,
-        input_type: str = "document"
+        input_type: str = "document",
+        output_dtype: str = "float"
     ) -> List[float]:
         """Generate embedding for a single text.
 
         Args:
             text: Text to embed
             input_type: Type of input ("document" or "query")
+            output_dtype: Embedding data type ("float" or "int8")
 
         Returns:
-            Embedding vector as list of floats
+            Embedding vector as list of floats (ints for "int8")
         """
-        result = await self.embed_texts([text], input_type=input_type)
-        return result.embeddings[0]
+        result = await self.embed_texts([text], input_type=input_type, output_dtype=output_dtype)
+        embedding: List[float] = result.embeddings[0].tolist()
+        return embedding
 
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client and the cache."""
         await self.client.aclose()
+        if self._owns_cache and self.cache is not None:
+            self.cache.close()
 
     async def __aenter__(self):
         """Async context manager entry."""
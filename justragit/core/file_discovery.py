@@ -6,12 +6,57 @@ with support for gitignore, whitelists, and blacklists.
 Extracted from Chimera's RAGWidget with improvements for standalone use.
 """
 
+import asyncio
+import hashlib
+import mimetypes
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
-import fnmatch
-import mimetypes
+
 import pathspec
 
+# Files at least this large are memory-mapped rather than read into a
+# bytes copy (below it, mmap setup costs more than it saves)
+MMAP_MIN_BYTES = 64 * 1024
+
+# Common text file extensions
+_TEXT_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h',
+    '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.sh',
+    '.html', '.css', '.xml', '.svg',
+    '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.env',
+    '.md', '.rst', '.txt',
+    '.dockerfile', '.makefile', '.sql',
+    '.pdf',
+})
+
+# Common text file names without extensions
+_TEXT_FILENAMES = frozenset({'dockerfile', 'makefile', 'readme', 'license', 'changelog'})
+
+
+def _hash_bytes(data: bytes | mmap.mmap) -> str:
+    """BLAKE2b hex digest (32 characters) used for change detection."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _walk_root(pattern: str) -> str:
+    """Leading directories of a whitelist pattern that contain no wildcards.
+
+    E.g. "docs/" -> "docs", "src/**/*.py" -> "src", "**/*.md" -> "".
+    """
+    parts = pattern.strip('/').split('/')
+    if not pattern.endswith('/'):
+        parts = parts[:-1]  # Last part names files, not a directory
+
+    root = []
+    for part in parts:
+        if any(c in part for c in '*?['):
+            break
+        root.append(part)
+    return '/'.join(root)
+
 
 class FileDiscovery:
     """Discover and load text files matching specified patterns.
@@ -27,10 +72,13 @@ class FileDiscovery:
         >>> discovery = FileDiscovery(
         ...     base_path="/path/to/project",
         ...     whitelist_paths=["docs/", "**/*.md"],
-        ...     blacklist_paths=["*/archive/"]
+        ...     blacklist_paths=["**/archive/"]
         ... )
         >>> documents = discovery.discover()
         >>> print(f"Found {len(documents)} files")
+
+        >>> # From async code (reads files concurrently):
+        >>> documents = await discovery.discover_async()
     """
 
     def __init__(
@@ -46,7 +94,7 @@ class FileDiscovery:
         Args:
             base_path: Base directory to search from
             whitelist_paths: Patterns to include (e.g., "docs/", "**/*.py")
-            blacklist_paths: Patterns to exclude (e.g., "*/archive/")
+            blacklist_paths: Patterns to exclude, in .gitignore syntax (e.g., "**/archive/")
             respect_gitignore: If True, respect .gitignore files
             max_file_size: Maximum file size in bytes (default: 1MB)
         """
@@ -56,6 +104,23 @@ class FileDiscovery:
         self.respect_gitignore = respect_gitignore
         self.max_file_size = max_file_size
 
+        # Whitelist patterns are anchored at base_path, matching Path.glob
+        # ("*.md" = top-level only, "**/*.md" = any depth, "docs/" = subtree)
+        self._whitelist_spec = pathspec.PathSpec.from_lines(
+            'gitwildmatch', ['/' + pattern.lstrip('/') for pattern in self.whitelist_paths]
+        )
+        # A leading "*/" (the older documented form, e.g. "*/archive/") means
+        # "at any depth", as it did with fnmatch; in .gitignore syntax it
+        # would only match one level below base_path
+        self._blacklist_spec = pathspec.PathSpec.from_lines(
+            'gitwildmatch',
+            ['**/' + pattern[2:] if pattern.startswith('*/') else pattern
+             for pattern in self.blacklist_paths]
+        )
+
+        # BLAKE2b digest of each file loaded by the last discover() call
+        self.file_hashes: dict[str, str] = {}
+
         # Load .gitignore if it exists and respect_gitignore is True
         self._gitignore_spec: Optional[pathspec.PathSpec] = None
         if self.respect_gitignore:
@@ -70,75 +135,179 @@ class FileDiscovery:
     def discover(self) -> dict[str, str]:
         """Discover and load all matching files.
 
+        Files are read in a thread pool (file I/O releases the GIL).
+
         Returns:
             Dict mapping relative_path -> file_content
         """
-        documents: dict[str, str] = {}
+        candidates = self._collect_candidates()
 
-        for pattern in self.whitelist_paths:
-            if pattern.endswith('/'):
-                # Directory pattern - get all files recursively
-                search_path = self.base_path / pattern.rstrip('/')
-                if search_path.exists() and search_path.is_dir():
-                    for file_path in search_path.rglob('*'):
-                        if file_path.is_file():
-                            self._load_file_if_not_excluded(file_path, documents)
-            else:
-                # Glob pattern
-                for file_path in self.base_path.glob(pattern):
-                    if file_path.is_file():
-                        self._load_file_if_not_excluded(file_path, documents)
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._read_file, candidates.values(), candidates.keys()))
+
+        documents: dict[str, str] = {}
+        self.file_hashes = {}
+        for rel_path_str, loaded in zip(candidates, results, strict=True):
+            if loaded is not None:
+                documents[rel_path_str], self.file_hashes[rel_path_str] = loaded
 
         return documents
 
-    def _load_file_if_not_excluded(self, file_path: Path, documents: dict[str, str]) -> None:
-        """Load file if it passes all filters.
+    async def discover_async(self, max_concurrency: int = 32) -> dict[str, str]:
+        """Discover and load all matching files without blocking the event loop.
+
+        Directory walking runs in a worker thread, and files are read
+        concurrently in threads (at most max_concurrency open at once).
 
         Args:
-            file_path: Absolute path to file
-            documents: Dict to add file content to
+            max_concurrency: Maximum number of files read at the same time
+
+        Returns:
+            Dict mapping relative_path -> file_content
         """
-        try:
-            rel_path = file_path.relative_to(self.base_path)
-        except ValueError:
-            return
+        candidates = await asyncio.to_thread(self._collect_candidates)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def read(rel_path_str: str, file_path: Path) -> Optional[tuple[str, str]]:
+            async with semaphore:
+                return await asyncio.to_thread(self._read_file, file_path, rel_path_str)
+
+        results = await asyncio.gather(
+            *(read(rel_path_str, file_path) for rel_path_str, file_path in candidates.items())
+        )
 
-        # Skip hidden files/directories
-        if any(part.startswith('.') for part in rel_path.parts):
-            return
+        documents: dict[str, str] = {}
+        self.file_hashes = {}
+        for rel_path_str, loaded in zip(candidates, results, strict=True):
+            if loaded is not None:
+                documents[rel_path_str], self.file_hashes[rel_path_str] = loaded
+
+        return documents
 
-        # Check gitignore
-        rel_path_str = str(rel_path)
+    def _collect_candidates(self) -> dict[str, Path]:
+        """Find all files matching the whitelist that pass the filters.
+
+        The tree is walked once (from the whitelist's fixed directory
+        prefixes), skipping hidden, gitignored and blacklisted directories
+        without descending into them.
+
+        Returns:
+            Dict mapping relative_path -> absolute file path
+        """
+        candidates: dict[str, Path] = {}
+
+        roots = sorted({_walk_root(pattern) for pattern in self.whitelist_paths})
+        if '' in roots:
+            roots = ['']
+        else:
+            # Drop roots nested inside another root
+            roots = [
+                root for root in roots
+                if not any(root.startswith(other + '/') for other in roots)
+            ]
+
+        stack = [
+            root for root in reversed(roots)
+            if not any(part.startswith('.') for part in root.split('/') if part)
+        ]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                with os.scandir(self.base_path / rel_dir) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                # Skip hidden files/directories
+                if entry.name.startswith('.'):
+                    continue
+
+                rel_path_str = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+                if entry.is_dir(follow_symlinks=False):
+                    if not self._is_excluded(rel_path_str + '/'):
+                        subdirs.append(rel_path_str)
+                elif entry.is_file() and self._whitelist_spec.match_file(rel_path_str):
+                    file_path = Path(entry.path)
+                    if self._check_file(file_path, rel_path_str, entry.stat().st_size):
+                        candidates[rel_path_str] = file_path
+
+            stack.extend(reversed(subdirs))
+
+        return candidates
+
+    def _is_excluded(self, rel_path_str: str) -> bool:
+        """Check a relative path against .gitignore and the blacklist."""
         if self._gitignore_spec and self._gitignore_spec.match_file(rel_path_str):
-            return
+            return True
+        return self._blacklist_spec.match_file(rel_path_str)
+
+    def _check_file(self, file_path: Path, rel_path_str: str, file_size: int) -> bool:
+        """Check whether a whitelisted file passes the remaining filters.
+
+        Args:
+            file_path: Absolute path to file
+            rel_path_str: Path relative to base_path ("/"-separated)
+            file_size: File size in bytes (from the directory walk)
 
-        # Check blacklist
-        for exclude_pattern in self.blacklist_paths:
-            if fnmatch.fnmatch(rel_path_str, exclude_pattern):
-                return
+        Returns:
+            True if the file should be loaded
+        """
+        if self._is_excluded(rel_path_str):
+            return False
 
         # Check if text file
-        if not self._is_text_file(file_path):
-            return
+        return self._is_text_file(file_path, file_size)
+
+    def _read_file(self, file_path: Path, rel_path_str: str) -> Optional[tuple[str, str]]:
+        """Load a file's text content and hash it.
 
-        # Load the file
+        Text files are hashed over the bytes read from disk, so the
+        content never has to be re-encoded to compute its hash.
+
+        Args:
+            file_path: Absolute path to file
+            rel_path_str: Relative path (for error messages)
+
+        Returns:
+            (content, BLAKE2b hex digest), or None if the file could not be read
+        """
         try:
-            # Handle PDF files with special extraction
+            # Handle PDF files with special extraction (hash the extracted text,
+            # so extractor changes also invalidate stored chunks)
             if file_path.suffix.lower() == '.pdf':
                 from .pdf_extractor import extract_text_from_pdf
                 content = extract_text_from_pdf(file_path)
-            else:
-                # Standard text file reading
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                return content, _hash_bytes(content.encode('utf-8'))
 
-            documents[rel_path_str] = content
+            # Standard text file reading
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                    # Hash and decode straight from the page cache, without
+                    # an intermediate bytes copy of the file
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        content = str(mm, 'utf-8')
+                        digest = _hash_bytes(mm)
+                else:
+                    raw = f.read()
+                    content = raw.decode('utf-8')
+                    digest = _hash_bytes(raw)
+
+            if '\r' in content:
+                # Match text-mode reading (universal newlines)
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+            return content, digest
 
         except (UnicodeDecodeError, Exception) as e:
             # Skip files that can't be read
             print(f"⚠️ Could not load {rel_path_str}: {e}")
+            return None
 
-    def _is_text_file(self, file_path: Path) -> bool:
+    def _is_text_file(self, file_path: Path, file_size: Optional[int] = None) -> bool:
         """Check if file is a text file.
 
         Uses multiple heuristics:
@@ -149,32 +318,26 @@ class FileDiscovery:
 
         Args:
             file_path: Path to file
+            file_size: File size in bytes, if already known (avoids a stat call)
 
         Returns:
             True if file appears to be a text file
         """
         # Skip files > max_file_size
-        if file_path.exists() and file_path.stat().st_size > self.max_file_size:
+        if file_size is None:
+            try:
+                file_size = file_path.stat().st_size
+            except OSError:
+                file_size = 0
+        if file_size > self.max_file_size:
             return False
 
-        # Common text file extensions
-        text_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h',
-            '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.sh',
-            '.html', '.css', '.xml', '.svg',
-            '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.env',
-            '.md', '.rst', '.txt',
-            '.dockerfile', '.makefile', '.sql',
-            '.pdf',
-        }
-
         # Check common filenames without extensions
-        filename = file_path.name.lower()
-        if filename in {'dockerfile', 'makefile', 'readme', 'license', 'changelog'}:
+        if file_path.name.lower() in _TEXT_FILENAMES:
             return True
 
         # Check extension
-        if file_path.suffix.lower() in text_extensions:
+        if file_path.suffix.lower() in _TEXT_EXTENSIONS:
             return True
 
         # Fallback to mime type
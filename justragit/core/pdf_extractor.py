@@ -2,11 +2,18 @@
 
 This module provides functionality to extract text content from PDF files
 for semantic search and RAG applications.
+
+Text is extracted with PyMuPDF when it is installed (much faster, C-native)
+and with pypdf otherwise.
 """
 
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
-import logging
 
 try:
     from pypdf import PdfReader
@@ -15,8 +22,92 @@ except ImportError:
         "pypdf is required for PDF support. Install it with: pip install pypdf"
     ) from None
 
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # Older PyMuPDF releases
+    except ImportError:
+        pymupdf = None
+
 logger = logging.getLogger(__name__)
 
+# PyMuPDF is not thread-safe, and files are discovered from worker threads,
+# so all PyMuPDF work is serialized through this lock
+_PYMUPDF_LOCK = threading.Lock()
+
+# Extract pages in worker processes only for PDFs with at least this many
+# pages (each worker parses the file again, so small PDFs stay serial)
+PARALLEL_EXTRACTION_MIN_PAGES = 32
+MAX_EXTRACTION_WORKERS = 8
+
+# Process pool shared by every extraction (files are extracted from many
+# discovery threads at once), created on first use
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def _get_extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared extraction pool, starting it if needed.
+
+    Workers are spawned rather than forked: callers are usually threads of
+    a multi-threaded process, where forking can deadlock.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extraction_pool
+
+
+def _open_reader(file_path: Path) -> PdfReader:
+    """Open a PDF, decrypting it with an empty password if needed."""
+    reader = PdfReader(str(file_path))
+
+    # Check if PDF is encrypted
+    if reader.is_encrypted:
+        logger.warning(f"Encrypted PDF file, attempting to decrypt: {file_path}")
+        # Try to decrypt with empty password (common for many PDFs)
+        if not reader.decrypt(""):
+            raise ValueError(f"Cannot decrypt encrypted PDF: {file_path}")
+
+    return reader
+
+
+def _extract_pages(reader: PdfReader, file_path: Path, start: int, end: int) -> list[str]:
+    """Extract the text of pages [start, end), formatted with page separators.
+
+    Pages without text (or that fail to extract) are skipped.
+    """
+    text_parts = []
+    for page_num in range(start, end):
+        try:
+            page = reader.pages[page_num]
+            page_text = page.extract_text()
+
+            if page_text and page_text.strip():
+                # Add page separator for context
+                text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
+            else:
+                logger.debug(f"No text found on page {page_num + 1} of {file_path}")
+
+        except Exception as e:
+            logger.warning(f"Error extracting text from page {page_num + 1} of {file_path}: {e}")
+            continue
+
+    return text_parts
+
+
+def _extract_page_range(file_path: Path, start: int, end: int) -> list[str]:
+    """Process pool worker: open the PDF and extract pages [start, end).
+
+    Each worker opens its own reader (readers cannot be shared across processes).
+    """
+    return _extract_pages(_open_reader(file_path), file_path, start, end)
+
 
 def extract_text_from_pdf(file_path: Path, max_pages: Optional[int] = None) -> str:
     """Extract text content from a PDF file.
@@ -35,42 +126,90 @@ def extract_text_from_pdf(file_path: Path, max_pages: Optional[int] = None) -> s
     if not file_path.exists():
         raise FileNotFoundError(f"PDF file not found: {file_path}")
 
-    try:
-        reader = PdfReader(str(file_path))
+    if pymupdf is not None:
+        return _extract_with_pymupdf(file_path, max_pages)
 
-        # Check if PDF is encrypted
-        if reader.is_encrypted:
-            logger.warning(f"Encrypted PDF file, attempting to decrypt: {file_path}")
-            # Try to decrypt with empty password (common for many PDFs)
-            if not reader.decrypt(""):
-                raise ValueError(f"Cannot decrypt encrypted PDF: {file_path}")
+    try:
+        reader = _open_reader(file_path)
 
         # Determine number of pages to process
         num_pages = len(reader.pages)
         pages_to_process = min(num_pages, max_pages) if max_pages else num_pages
 
-        # Extract text from each page
-        text_parts = []
-        for page_num in range(pages_to_process):
-            try:
-                page = reader.pages[page_num]
-                page_text = page.extract_text()
+        # Extract text from each page (in contiguous page ranges across
+        # the shared worker processes for long documents)
+        workers = min(MAX_EXTRACTION_WORKERS, os.cpu_count() or 1)
+        if pages_to_process < PARALLEL_EXTRACTION_MIN_PAGES or workers < 2:
+            text_parts = _extract_pages(reader, file_path, 0, pages_to_process)
+        else:
+            bounds = [pages_to_process * i // workers for i in range(workers + 1)]
+            ranges = _get_extraction_pool(workers).map(
+                _extract_page_range,
+                [file_path] * workers,
+                bounds[:-1],
+                bounds[1:]
+            )
+            text_parts = [part for page_range in ranges for part in page_range]
+
+        if not text_parts:
+            logger.warning(f"No text content extracted from PDF: {file_path}")
+            return ""
+
+        # Join all pages with double newline for paragraph separation
+        full_text = "\n\n".join(text_parts)
+
+        logger.debug(f"Extracted {len(full_text)} characters from {pages_to_process} pages of {file_path}")
+
+        return full_text
+
+    except Exception as e:
+        logger.exception(f"Failed to extract text from PDF {file_path}: {e}")
+        raise ValueError(f"Error processing PDF file {file_path}: {e}") from e
+
 
-                if page_text and page_text.strip():
-                    # Add page separator for context
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                else:
-                    logger.debug(f"No text found on page {page_num + 1} of {file_path}")
+def _extract_with_pymupdf(file_path: Path, max_pages: Optional[int] = None) -> str:
+    """Extract text with PyMuPDF, in the same format as the pypdf path.
 
-            except Exception as e:
-                logger.warning(f"Error extracting text from page {page_num + 1} of {file_path}: {e}")
-                continue
+    Args:
+        file_path: Path to the PDF file
+        max_pages: Optional maximum number of pages to extract (None = all pages)
+
+    Returns:
+        Extracted text content as a string
+
+    Raises:
+        ValueError: If the PDF is encrypted or corrupted
+    """
+    try:
+        with _PYMUPDF_LOCK, pymupdf.open(str(file_path)) as doc:
+            if doc.needs_pass:
+                logger.warning(f"Encrypted PDF file, attempting to decrypt: {file_path}")
+                # Try to decrypt with empty password (common for many PDFs)
+                if not doc.authenticate(""):
+                    raise ValueError(f"Cannot decrypt encrypted PDF: {file_path}")
+
+            num_pages = doc.page_count
+            pages_to_process = min(num_pages, max_pages) if max_pages else num_pages
+
+            text_parts = []
+            for page_num in range(pages_to_process):
+                try:
+                    page_text = doc.load_page(page_num).get_text("text")
+
+                    if page_text and page_text.strip():
+                        # Add page separator for context
+                        text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
+                    else:
+                        logger.debug(f"No text found on page {page_num + 1} of {file_path}")
+
+                except Exception as e:
+                    logger.warning(f"Error extracting text from page {page_num + 1} of {file_path}: {e}")
+                    continue
 
         if not text_parts:
             logger.warning(f"No text content extracted from PDF: {file_path}")
             return ""
 
-        # Join all pages with double newline for paragraph separation
         full_text = "\n\n".join(text_parts)
 
         logger.debug(f"Extracted {len(full_text)} characters from {pages_to_process} pages of {file_path}")
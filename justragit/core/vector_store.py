@@ -4,12 +4,22 @@ This module provides persistence and retrieval of document embeddings using Chro
 Collections are organized by content hash for automatic invalidation and cross-thread reuse.
 """
 
+import hashlib
+import json
 import os
+import re
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+from string import Formatter
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from datetime import datetime, timezone, timedelta
+
+import numpy as np
 
 try:
     import chromadb
@@ -18,6 +28,90 @@ except ImportError:
     chromadb = None
 
 
+# HNSW index settings applied when a per-base_path collection is created.
+# Chroma builds the index with these once; they cannot change afterwards.
+# Embeddings are L2-normalized before they are stored, so inner product
+# is cosine similarity without Chroma normalizing every vector itself.
+HNSW_SETTINGS: Dict[str, Any] = {
+    "hnsw:space": "ip",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 64,
+}
+
+# Query cache defaults: number of recent queries remembered, and the cosine
+# similarity above which a new query reuses a remembered query's results.
+# Off by default, since a cached answer belongs to a (slightly) different
+# query; pass query_cache_size (e.g. 256) to opt in.
+QUERY_CACHE_SIZE = 0
+QUERY_CACHE_THRESHOLD = 0.97
+
+# Collections with fewer chunks than this are searched exactly with one
+# matrix-vector product over an in-memory copy of their embeddings
+# (50k x 1024-dim float32 = 200 MB), instead of through the HNSW index
+DIRECT_SEARCH_MAX_CHUNKS = 50_000
+
+# Collections deleted concurrently by cleanup_old_collections
+MAX_CLEANUP_WORKERS = 4
+
+# Decimal strings of chunk indices, preformatted for building chunk IDs
+# (files with more chunks format the rest on demand)
+_INDEX_STRINGS = [str(i) for i in range(4096)]
+
+# Rows fetched per collection.get() page when building the file_path index
+INDEX_SCAN_PAGE_SIZE = 5000
+
+# Rows accumulated by store_file_chunks inside VectorStore.batch() before
+# they are written to ChromaDB together
+DEFAULT_WRITE_BATCH_SIZE = 250
+
+# One embedding per row: a (n, dim) array, or a list of vectors
+Embeddings = np.ndarray | List[List[float]] | List[np.ndarray]
+
+# (file_path, file_hash, chunks, embeddings, metadatas), as taken by
+# VectorStore.bulk_store_file_chunks
+FileChunks = tuple[str, str, List[str], Embeddings, Optional[List[Dict[str, Any]]]]
+
+
+@lru_cache(maxsize=65536)
+def _short_hash(text: str, length: int) -> str:
+    """First `length` hex digits of the SHA-256 of text (memoized).
+
+    Used for collection names and chunk ID prefixes, so it must stay
+    SHA-256: changing it would orphan existing collections and chunk IDs.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:length]
+
+
+# Distance spaces in which 1 - distance is the cosine similarity of
+# (normalized) embeddings: "cosine", and "ip" for collections this store
+# created, whose embeddings are all unit length
+_COSINE_SPACES = frozenset({"cosine", "ip"})
+
+# Collection metadata key counting write sessions (bumped on the first write
+# after the file index is loaded or saved); saved with the side file so a
+# side file that missed another process's writes is detected
+WRITE_GENERATION_KEY = "justragit:write_generation"
+
+
+def _collection_space(collection) -> str:
+    """Distance function of a collection ("l2", "ip" or "cosine")."""
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        # Dropped from the metadata by modify() (see _bump_write_generation),
+        # but still in the collection's configuration
+        configuration = getattr(collection, "configuration", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row of a float32 matrix to unit length, in place (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
 @dataclass
 class SearchResult:
     """Result from vector similarity search."""
@@ -59,18 +153,49 @@ class SearchResult:
             return f"## {file_path} (relevance: {self.score:.2f})\n{self.content}\n\n---"
 
         # Custom template - provide access to common fields
+        return _compile_template(template)(self)
+
+
+# Fields available to custom result templates
+_TEMPLATE_FIELDS = ("file_path", "score", "content", "chunk_index")
+
+
+def _invalid_template_field(field: str) -> ValueError:
+    return ValueError(
+        f"Invalid field in template: {field!r}. "
+        f"Available fields: {', '.join(_TEMPLATE_FIELDS)}"
+    )
+
+
+@lru_cache(maxsize=64)
+def _compile_template(template: str) -> Callable[[SearchResult], str]:
+    """Validate a result template once and return a renderer for it.
+
+    Raises:
+        ValueError: If the template is malformed or uses an unknown field
+    """
+    for _, field_name, _, _ in Formatter().parse(template):
+        if field_name is None:
+            continue
+        field = re.split(r'[.\[]', field_name, maxsplit=1)[0]
+        if field and not field.isdigit() and field not in _TEMPLATE_FIELDS:
+            raise _invalid_template_field(field)
+
+    format_map = template.format_map
+
+    def render(result: SearchResult) -> str:
         try:
-            return template.format(
-                file_path=self.metadata.get('file_path', 'unknown'),
-                score=self.score,
-                content=self.content,
-                chunk_index=self.chunk_index
-            )
+            return format_map({
+                "file_path": result.metadata.get('file_path', 'unknown'),
+                "score": result.score,
+                "content": result.content,
+                "chunk_index": result.chunk_index,
+            })
         except KeyError as e:
-            raise ValueError(
-                f"Invalid field in template: {e}. "
-                f"Available fields: file_path, score, content, chunk_index"
-            ) from e
+            # E.g. an unknown field nested in a format spec
+            raise _invalid_template_field(e.args[0]) from e
+
+    return render
 
 
 def format_results(results: List[SearchResult], template: Optional[str] = None) -> str:
@@ -103,7 +228,238 @@ def format_results(results: List[SearchResult], template: Optional[str] = None)
     if not results:
         return ""
 
-    return "\n\n".join(result.to_string(template) for result in results)
+    if template is None:
+        # Default template inlined (same output as SearchResult.to_string())
+        return "\n\n".join(
+            f"## {result.metadata.get('file_path', 'unknown')} "
+            f"(relevance: {result.score:.2f})\n{result.content}\n\n---"
+            for result in results
+        )
+
+    render = _compile_template(template)
+    return "\n\n".join(render(result) for result in results)
+
+
+# (scores, documents, metadatas) of one query's hits, best match first
+RawResults = tuple[np.ndarray, List[str], List[Dict[str, Any]]]
+
+
+def _empty_raw_results() -> RawResults:
+    return np.zeros(0, dtype=np.float32), [], []
+
+
+def _raw_query_results(results: Mapping[str, Any], collection, query_index: int = 0) -> RawResults:
+    """Extract one query's hits from a collection.query() response.
+
+    Distances are converted to similarity scores for the collection's
+    distance space in one vectorized step: 1 - distance for cosine and
+    inner product (cosine similarity for normalized embeddings), and
+    1 / (1 + distance) for L2 (collections created without a space).
+    """
+    if not results["documents"] or len(results["documents"]) <= query_index:
+        return _empty_raw_results()
+
+    documents = results["documents"][query_index]
+    distances = np.asarray(results["distances"][query_index], dtype=np.float32)
+    metadatas = (
+        results["metadatas"][query_index] if results["metadatas"] else [{}] * len(documents)
+    )
+
+    if _collection_space(collection) == "l2":
+        scores = 1.0 / (1.0 + distances)
+    else:
+        scores = 1.0 - distances
+
+    return scores, documents, metadatas
+
+
+def _to_search_results(raw: RawResults) -> List[SearchResult]:
+    """Wrap raw (scores, documents, metadatas) hits in SearchResult objects."""
+    scores, documents, metadatas = raw
+    return [
+        SearchResult(
+            content=doc,
+            score=score,
+            metadata=metadata,
+            chunk_index=metadata.get("chunk_index", -1)
+        )
+        for doc, score, metadata in zip(documents, scores.tolist(), metadatas, strict=True)
+    ]
+
+
+class _DirectIndex:
+    """In-memory copy of a small collection for exact (brute-force) search.
+
+    Embeddings are stored L2-normalized in one float32 matrix, so cosine
+    similarity to a query is a single matrix-vector product.
+    """
+
+    def __init__(self, collection, page_size: int):
+        embeddings: List[np.ndarray] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+
+        offset = 0
+        while True:
+            results = collection.get(
+                limit=page_size,
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"]
+            )
+            ids = results["ids"] if results else []
+            if ids:
+                embeddings.append(np.asarray(results["embeddings"], dtype=np.float32))
+                self.documents.extend(results["documents"])
+                self.metadatas.extend(metadata or {} for metadata in results["metadatas"])
+            if len(ids) < page_size:
+                break
+            offset += page_size
+
+        if embeddings:
+            matrix = _l2_normalize(np.ascontiguousarray(np.concatenate(embeddings)))
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        self.matrix = matrix
+        self.file_paths = [metadata.get("file_path") for metadata in self.metadatas]
+
+    def search(
+        self,
+        query_embedding,
+        file_paths: Optional[List[str]],
+        top_k: int
+    ) -> RawResults:
+        """Exact top_k by cosine similarity, optionally within file_paths."""
+        return self.search_many([query_embedding], file_paths, top_k)[0]
+
+    def search_many(
+        self,
+        query_embeddings,
+        file_paths: Optional[List[str]],
+        top_k: int
+    ) -> List[RawResults]:
+        """Exact top_k for several queries, with one matrix-matrix product."""
+        queries = _l2_normalize(np.array(query_embeddings, dtype=np.float32, ndmin=2))
+        if len(self.documents) == 0 or top_k <= 0:
+            return [_empty_raw_results() for _ in range(len(queries))]
+
+        if file_paths is not None:
+            wanted = set(file_paths)
+            rows = np.fromiter(
+                (i for i, path in enumerate(self.file_paths) if path in wanted),
+                dtype=np.intp
+            )
+            candidates = self.matrix[rows]
+        else:
+            rows = None
+            candidates = self.matrix
+
+        # (n_candidates, n_queries) cosine similarities
+        similarities = candidates @ queries.T
+
+        raw_results = []
+        for column in similarities.T:
+            if top_k < len(column):
+                top = np.argpartition(-column, top_k)[:top_k]
+            else:
+                top = np.arange(len(column))
+            top = top[np.argsort(-column[top], kind="stable")]
+
+            top_rows = (rows[top] if rows is not None else top).tolist()
+            raw_results.append((
+                column[top],
+                [self.documents[i] for i in top_rows],
+                [self.metadatas[i] for i in top_rows],
+            ))
+        return raw_results
+
+
+def _copy_results(results: List[SearchResult]) -> List[SearchResult]:
+    """Copy search results (and their metadata) so callers cannot alter cached ones."""
+    return [replace(result, metadata=dict(result.metadata)) for result in results]
+
+
+class _QueryCache:
+    """Proximity cache of recent search results.
+
+    A query is answered from the cache when its embedding is within
+    cosine similarity `threshold` of a cached query with the same scope
+    (base_path, file filter, top_k). Query embeddings are kept
+    L2-normalized in one matrix, so a lookup is a single matrix-vector
+    product. The least recently used entry is overwritten when full.
+    """
+
+    def __init__(self, size: int, threshold: float):
+        self.size = size
+        self.threshold = threshold
+        self._keys: Optional[np.ndarray] = None  # (size, dim) float32
+        self._scopes: List[Optional[tuple]] = [None] * size
+        self._values: List[Optional[List[SearchResult]]] = [None] * size
+        self._last_used = np.zeros(size, dtype=np.int64)
+        self._clock = 0
+
+    @staticmethod
+    def _normalize(query_embedding) -> Optional[np.ndarray]:
+        vector = np.array(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        vector /= norm
+        return vector
+
+    def get(self, scope: tuple, query_embedding) -> Optional[List[SearchResult]]:
+        """Return cached results for a near-identical query, or None."""
+        vector = self._normalize(query_embedding)
+        if self._keys is None or vector is None or vector.shape[0] != self._keys.shape[1]:
+            return None
+
+        similarities = self._keys @ vector
+        best = None
+        for slot in np.flatnonzero(similarities >= self.threshold):
+            if self._scopes[slot] == scope and (best is None or similarities[slot] > similarities[best]):
+                best = slot
+        if best is None:
+            return None
+        results = self._values[best]
+        if results is None:
+            return None
+
+        self._clock += 1
+        self._last_used[best] = self._clock
+        return _copy_results(results)
+
+    def put(self, scope: tuple, query_embedding, results: List[SearchResult]) -> None:
+        """Remember results for a query, evicting the least recently used entry."""
+        vector = self._normalize(query_embedding)
+        if vector is None:
+            return
+        if self._keys is None or vector.shape[0] != self._keys.shape[1]:
+            self._keys = np.zeros((self.size, vector.shape[0]), dtype=np.float32)
+            self.clear()
+
+        slot = int(np.argmin(self._last_used))
+        self._keys[slot] = vector
+        self._scopes[slot] = scope
+        self._values[slot] = _copy_results(results)
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+    def invalidate(self, base_path: str) -> None:
+        """Drop every entry for base_path."""
+        for slot, scope in enumerate(self._scopes):
+            if scope is not None and scope[0] == base_path:
+                self._clear_slot(slot)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        for slot in range(self.size):
+            self._clear_slot(slot)
+
+    def _clear_slot(self, slot: int) -> None:
+        if self._keys is not None:
+            self._keys[slot] = 0.0  # Zero rows never reach the threshold
+        self._scopes[slot] = None
+        self._values[slot] = None
+        self._last_used[slot] = 0
 
 
 class VectorStore:
@@ -116,12 +472,22 @@ class VectorStore:
     - Lazy loading (check if file embeddings exist before generating)
     - Persistent storage on disk
     - Age-based cleanup of old collections
+    - HNSW approximate nearest-neighbour search (inner product over
+      L2-normalized embeddings, i.e. cosine similarity)
+    - Exact in-memory search for small collections (see direct_search_max_chunks)
+    - In-memory cache of recent results for near-duplicate queries
+    - Write batching across store_file_chunks calls (see batch())
     """
 
     def __init__(
         self,
         persist_directory: Optional[str] = None,
-        collection_prefix: str = "rag_"
+        collection_prefix: str = "rag_",
+        hnsw_search_ef: int = 100,
+        query_cache_size: int = QUERY_CACHE_SIZE,
+        query_cache_threshold: float = QUERY_CACHE_THRESHOLD,
+        batch_size: Optional[int] = None,
+        direct_search_max_chunks: int = DIRECT_SEARCH_MAX_CHUNKS
     ):
         """Initialize vector store.
 
@@ -130,6 +496,18 @@ class VectorStore:
                 (defaults to data/chromadb)
             collection_prefix: Prefix for collection names
                 (default: "rag_" for global collections per base_path)
+            hnsw_search_ef: HNSW candidate list size at query time. Higher
+                values improve recall at the cost of latency. Applied when
+                a collection is created.
+            query_cache_size: Number of recent searches whose results are
+                kept in memory (default 0: the query cache is off)
+            query_cache_threshold: Cosine similarity at or above which a
+                query reuses a cached query's results (with the same
+                base_path, file filter and top_k)
+            batch_size: Rows accumulated inside batch() before they are
+                written (defaults to $CHROMADB_BATCH_SIZE, or 250)
+            direct_search_max_chunks: Collections with fewer chunks are
+                searched exactly in memory instead of via HNSW (0 disables)
         """
         if chromadb is None:
             raise ImportError(
@@ -143,6 +521,37 @@ class VectorStore:
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(parents=True, exist_ok=True)
         self.collection_prefix = collection_prefix
+        self.hnsw_search_ef = hnsw_search_ef
+        self._batch_size_limit: Optional[int] = None
+        # base_path -> {file_path: file_hash} (from the side file or a scan)
+        # and {file_path: [chunk ids]} (from a scan only), kept in sync by
+        # this store's writes
+        self._file_hashes: Dict[str, Dict[str, str]] = {}
+        self._path_ids: Dict[str, Dict[str, List[str]]] = {}
+        # base_paths written since their file-hash side file was last saved,
+        # and the write generation this store set for each
+        self._dirty_file_indexes: set = set()
+        self._write_generations: Dict[str, int] = {}
+        # base_path -> collection name / ChromaDB collection handle
+        self._collection_names: Dict[str, str] = {}
+        self._collections: Dict[str, Any] = {}
+        # Recent search results, dropped for a base_path whenever it is written
+        self._query_cache: Optional[_QueryCache] = (
+            _QueryCache(query_cache_size, query_cache_threshold)
+            if query_cache_size > 0 else None
+        )
+
+        # base_path -> in-memory copy of a small collection, for exact search
+        self.direct_search_max_chunks = direct_search_max_chunks
+        self._direct_indexes: Dict[str, _DirectIndex] = {}
+
+        # Pending store_file_chunks calls per base_path while batching
+        if batch_size is None:
+            batch_size = int(os.getenv("CHROMADB_BATCH_SIZE", DEFAULT_WRITE_BATCH_SIZE))
+        self.batch_size = batch_size
+        self._batching = False
+        self._pending: Dict[str, List[FileChunks]] = {}
+        self._pending_rows: Dict[str, int] = {}
 
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
@@ -166,84 +575,378 @@ class VectorStore:
         Returns:
             Collection name string (e.g., "rag_a1b2c3d4")
         """
-        import hashlib
-        path_hash = hashlib.sha256(base_path.encode('utf-8')).hexdigest()[:16]
-        return f"{self.collection_prefix}{path_hash}"
+        collection_name = self._collection_names.get(base_path)
+        if collection_name is None:
+            collection_name = f"{self.collection_prefix}{_short_hash(base_path, 16)}"
+            self._collection_names[base_path] = collection_name
+        return collection_name
 
     def get_or_create_collection(self, base_path: str):
         """Get or create collection for a base_path.
 
+        The collection is looked up first, so creation metadata (with a
+        fresh created_at) is only built when it really has to be created.
+
         Args:
             base_path: Absolute path to project directory
 
         Returns:
             ChromaDB collection object
         """
+        collection = self._get_existing_collection(base_path)
+        if collection is not None:
+            return collection
+
         collection_name = self.get_collection_name(base_path)
 
         collection_metadata = {
             "base_path": base_path,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **HNSW_SETTINGS,
+            "hnsw:search_ef": self.hnsw_search_ef,
         }
 
-        return self.client.get_or_create_collection(
+        collection = self.client.get_or_create_collection(
             name=collection_name,
             metadata=collection_metadata
         )
+        self._collections[base_path] = collection
+        return collection
+
+    def _get_existing_collection(self, base_path: str):
+        """Get the collection for a base_path without creating it.
+
+        Args:
+            base_path: Absolute path to project directory
+
+        Returns:
+            ChromaDB collection object, or None if it does not exist
+        """
+        collection = self._collections.get(base_path)
+        if collection is None:
+            try:
+                collection = self.client.get_collection(name=self.get_collection_name(base_path))
+            except Exception:
+                return None
+            self._collections[base_path] = collection
+        return collection
 
     def get_file_hashes(self, base_path: str) -> Dict[str, str]:
         """Get all file hashes currently stored in collection.
 
+        The hashes are loaded once per base_path (from the side file saved
+        by save_file_index(), or by scanning the collection); later calls
+        are answered from memory, which this store updates on every write.
+
         Args:
             base_path: Absolute path to project directory
 
         Returns:
             Dict mapping file_path to file_hash
         """
-        collection_name = self.get_collection_name(base_path)
+        self._flush_pending(base_path)
+        if not self._load_file_hashes(base_path):
+            return {}
+        return dict(self._file_hashes[base_path])
+
+    def _load_file_hashes(self, base_path: str) -> bool:
+        """Load the file_path -> file_hash map for base_path.
+
+        Read from the side file written by save_file_index() when that is
+        still current, otherwise built by scanning the collection.
+
+        Args:
+            base_path: Absolute path to project directory
+
+        Returns:
+            True if the map is available, False if there is no collection yet
+        """
+        if base_path in self._file_hashes:
+            return True
+
+        collection = self._get_existing_collection(base_path)
+        if collection is None:
+            return False
+
+        if not self._read_file_index(base_path, collection):
+            self._scan_path_index(base_path, collection)
+        return True
+
+    def _scan_path_index(self, base_path: str, collection) -> None:
+        """Build the file_path -> hash / chunk ids index for base_path.
 
+        Scans the collection's metadata one page of INDEX_SCAN_PAGE_SIZE
+        rows at a time (so peak memory does not grow with the collection).
+        Afterwards the index is maintained by this store's writes, assuming
+        no other process writes to the same collection meanwhile.
+        """
+        generation = self._write_generation(base_path)
+        file_hashes: Dict[str, str] = {}
+        path_ids: Dict[str, List[str]] = {}
+        offset = 0
+        while True:
+            results = collection.get(
+                limit=INDEX_SCAN_PAGE_SIZE,
+                offset=offset,
+                include=["metadatas"]
+            )
+            ids = results["ids"] if results else []
+            for chunk_id, metadata in zip(ids, results["metadatas"] or [], strict=False):
+                file_path = (metadata or {}).get("file_path")
+                if not file_path:
+                    continue
+                path_ids.setdefault(file_path, []).append(chunk_id)
+                file_hash = metadata.get("file_hash")
+                if file_hash:
+                    file_hashes[file_path] = file_hash
+
+            if len(ids) < INDEX_SCAN_PAGE_SIZE:
+                break
+            offset += INDEX_SCAN_PAGE_SIZE
+
+        self._file_hashes[base_path] = file_hashes
+        self._path_ids[base_path] = path_ids
+
+        # The scan reflects the collection as stored, so save it right away
+        if generation is not None:
+            self._write_file_index(base_path, generation)
+        self._dirty_file_indexes.discard(base_path)
+
+    def _file_index_path(self, base_path: str) -> Path:
+        """Side file holding the file hashes of base_path's collection."""
+        return self.persist_directory / f"{self.get_collection_name(base_path)}.hashes.json"
+
+    def _write_generation(self, base_path: str) -> Optional[int]:
+        """Current write generation of base_path's collection.
+
+        Read from ChromaDB rather than the cached handle, whose metadata
+        does not see other processes' writes.
+
+        Returns:
+            The generation, or None if the collection does not exist
+        """
         try:
-            collection = self.client.get_collection(name=collection_name)
+            collection = self.client.get_collection(name=self.get_collection_name(base_path))
         except Exception:
+            return None
+        return int((collection.metadata or {}).get(WRITE_GENERATION_KEY, 0))
+
+    def _bump_write_generation(self, base_path: str) -> None:
+        """Increment the write generation stored in base_path's collection metadata."""
+        try:
+            collection = self.client.get_collection(name=self.get_collection_name(base_path))
+        except Exception:
+            return
+        # modify() replaces the metadata, and rejects the hnsw:* creation
+        # settings (they stay in the collection's configuration)
+        metadata = {
+            key: value for key, value in (collection.metadata or {}).items()
+            if not key.startswith("hnsw:")
+        }
+        generation = int(metadata.get(WRITE_GENERATION_KEY, 0)) + 1
+        collection.modify(metadata={**metadata, WRITE_GENERATION_KEY: generation})
+        self._write_generations[base_path] = generation
+
+    def _read_file_index(self, base_path: str, collection) -> bool:
+        """Load file hashes from the side file, if nothing was written since it was saved.
+
+        The side file is current when the collection's write generation and
+        row count both match the ones saved with it.
+
+        Returns:
+            True if the file hashes were loaded, False if they must be rebuilt
+        """
+        try:
+            data = json.loads(self._file_index_path(base_path).read_bytes())
+        except (OSError, ValueError):
+            return False
+
+        if (
+            not isinstance(data, dict)
+            or data.get("generation") != self._write_generation(base_path)
+            or data.get("count") != collection.count()
+        ):
+            return False
+
+        self._file_hashes[base_path] = data["file_hashes"]
+        return True
+
+    def save_file_index(self, base_path: Optional[str] = None) -> None:
+        """Save the file hashes of changed collections to their side files.
+
+        Lets the next process skip the metadata scan in get_file_hashes().
+        Called at the end of flush_batch(); callers making individual
+        writes should call it once when they are done.
+
+        Args:
+            base_path: Collection to save (None = every changed collection)
+        """
+        base_paths = [base_path] if base_path is not None else list(self._dirty_file_indexes)
+        for path in base_paths:
+            if path not in self._dirty_file_indexes:
+                continue
+            self._dirty_file_indexes.discard(path)
+            generation = self._write_generations.get(path)
+            # Skipped if another process wrote meanwhile (the index may have
+            # missed its writes); the next load scans instead
+            if (
+                path in self._file_hashes
+                and generation is not None
+                and generation == self._write_generation(path)
+            ):
+                self._write_file_index(path, generation)
+
+    def _write_file_index(self, base_path: str, generation: int) -> None:
+        """Write base_path's file hashes to its side file, replacing it atomically.
+
+        The collection's row count and write generation are saved with it,
+        so a side file that missed writes (e.g. by another process) is
+        detected and ignored.
+        """
+        path = self._file_index_path(base_path)
+        data = {
+            "count": self._get_existing_collection(base_path).count(),
+            "generation": generation,
+            "file_hashes": self._file_hashes[base_path],
+        }
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")))
+            tmp_path.replace(path)
+        except OSError as e:
+            print(f"⚠️  Could not save file index for {base_path}: {e}")
+
+    def _record_write(self, base_path: str) -> None:
+        """Note a write to base_path's collection.
+
+        Drops cached search results. The first time after a save it also
+        removes the side file (it is rewritten by save_file_index()), so a
+        crash before the next save cannot leave a stale one behind, and
+        bumps the collection's write generation, so other processes ignore
+        their copies.
+        """
+        self._direct_indexes.pop(base_path, None)
+        if self._query_cache is not None:
+            self._query_cache.invalidate(base_path)
+
+        if base_path not in self._dirty_file_indexes:
+            self._dirty_file_indexes.add(base_path)
+            self._file_index_path(base_path).unlink(missing_ok=True)
+            self._bump_write_generation(base_path)
+
+    def _file_chunk_ids(self, base_path: str, file_path: str) -> List[str]:
+        """IDs of the chunks stored for a file (empty if none)."""
+        if base_path not in self._path_ids:
+            collection = self._get_existing_collection(base_path)
+            if collection is None:
+                return []
+            self._scan_path_index(base_path, collection)
+        return self._path_ids[base_path].get(file_path, [])
+
+    def get_chunk_embeddings(self, base_path: str, file_path: str) -> Dict[str, np.ndarray]:
+        """Get stored embeddings for a file's chunks, keyed by chunk content hash.
+
+        Lets callers reuse embeddings for chunks that did not change when
+        a file is re-chunked after an edit. Chunks stored without a
+        chunk_hash are skipped.
+
+        Args:
+            base_path: Absolute path to project directory
+            file_path: Relative path to file within base_path
+
+        Returns:
+            Dict mapping chunk_hash to embedding vector (float32 array)
+        """
+        self._flush_pending(base_path)
+        chunk_ids = self._file_chunk_ids(base_path, file_path)
+        if not chunk_ids:
             return {}
 
-        # Get all items with their metadata
-        # We need to get unique file_path + file_hash combinations
-        results = collection.get(include=["metadatas"])
+        collection = self._get_existing_collection(base_path)
+        results = collection.get(ids=chunk_ids, include=["embeddings", "metadatas"])
 
-        file_hashes = {}
-        if results and results.get("metadatas"):
-            for metadata in results["metadatas"]:
-                file_path = metadata.get("file_path")
-                file_hash = metadata.get("file_hash")
-                if file_path and file_hash:
-                    file_hashes[file_path] = file_hash
+        embeddings = results.get("embeddings") if results else None
+        if embeddings is None or len(embeddings) == 0:
+            return {}
 
-        return file_hashes
+        chunk_embeddings = {}
+        for embedding, metadata in zip(embeddings, results["metadatas"] or [], strict=False):
+            chunk_hash = (metadata or {}).get("chunk_hash")
+            if chunk_hash:
+                chunk_embeddings[chunk_hash] = np.asarray(embedding, dtype=np.float32)
 
-    def delete_file_chunks(self, base_path: str, file_path: str) -> int:
-        """Delete all chunks for a specific file.
+        return chunk_embeddings
+
+    def update_file_hash(self, base_path: str, file_path: str, file_hash: str) -> int:
+        """Re-tag all chunks of a file with a new file_hash, keeping embeddings.
 
         Args:
             base_path: Absolute path to project directory
             file_path: Relative path to file within base_path
+            file_hash: New hash of file content
 
         Returns:
-            Number of chunks deleted
+            Number of chunks updated
         """
-        collection = self.get_or_create_collection(base_path)
+        self._flush_pending(base_path)
+        chunk_ids = self._file_chunk_ids(base_path, file_path)
+        if not chunk_ids:
+            return 0
 
-        # Get all chunk IDs for this file
-        results = collection.get(
-            where={"file_path": file_path},
-            include=["metadatas"]
-        )
+        collection = self.get_or_create_collection(base_path)
+        results = collection.get(ids=chunk_ids, include=["metadatas"])
 
         if not results or not results.get("ids"):
             return 0
 
-        chunk_ids = results["ids"]
+        metadatas = [
+            {**(metadata or {}), "file_hash": file_hash}
+            for metadata in results["metadatas"]
+        ]
+        collection.update(ids=results["ids"], metadatas=metadatas)
+        self._record_write(base_path)
+        if base_path in self._file_hashes:
+            self._file_hashes[base_path][file_path] = file_hash
+
+        return len(results["ids"])
+
+    def delete_file_chunks(self, base_path: str, file_path: str) -> int:
+        """Delete all chunks for a specific file.
+
+        Uses the file_path index when it is loaded; otherwise deletes with a
+        where filter (counting rows before and after) rather than scanning
+        the collection to build the index.
+
+        Args:
+            base_path: Absolute path to project directory
+            file_path: Relative path to file within base_path
+
+        Returns:
+            Number of chunks deleted
+        """
+        self._flush_pending(base_path)
+        if base_path not in self._path_ids:
+            collection = self._get_existing_collection(base_path)
+            if collection is None:
+                return 0
+            count_before = collection.count()
+            collection.delete(where={"file_path": file_path})
+            deleted: int = count_before - collection.count()
+            if deleted:
+                self._record_write(base_path)
+                if base_path in self._file_hashes:
+                    self._file_hashes[base_path].pop(file_path, None)
+            return deleted
+
+        chunk_ids = self._file_chunk_ids(base_path, file_path)
+        if not chunk_ids:
+            return 0
+
+        collection = self.get_or_create_collection(base_path)
         collection.delete(ids=chunk_ids)
+        self._record_write(base_path)
+        self._file_hashes[base_path].pop(file_path, None)
+        self._path_ids[base_path].pop(file_path, None)
 
         return len(chunk_ids)
 
@@ -253,7 +956,7 @@ class VectorStore:
         file_path: str,
         file_hash: str,
         chunks: List[str],
-        embeddings: List[List[float]],
+        embeddings: Embeddings,
         metadatas: Optional[List[Dict[str, Any]]] = None
     ) -> None:
         """Store chunks for a single file.
@@ -261,11 +964,16 @@ class VectorStore:
         Args:
             base_path: Absolute path to project directory
             file_path: Relative path to file within base_path
-            file_hash: SHA256 hash of file content
+            file_hash: Hash of file content
             chunks: List of text chunks for this file
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors, preferably a (len(chunks), dim)
+                float32 array (anything else is converted to one)
             metadatas: Optional metadata for each chunk
 
+        Inside batch(), the chunks are held back and written together with
+        other files' chunks once batch_size rows are pending (or when the
+        batch ends).
+
         Raises:
             ValueError: If chunks and embeddings lengths don't match
         """
@@ -275,35 +983,172 @@ class VectorStore:
                 "must have same length"
             )
 
-        # Skip if no chunks (file too small or no content)
-        if len(chunks) == 0:
+        # Pending chunks are held as one compact array, not lists of floats
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        file_chunks = (file_path, file_hash, chunks, embeddings, metadatas)
+        if not self._batching:
+            self.bulk_store_file_chunks(base_path, [file_chunks])
             return
 
-        collection = self.get_or_create_collection(base_path)
+        self._pending.setdefault(base_path, []).append(file_chunks)
+        self._pending_rows[base_path] = self._pending_rows.get(base_path, 0) + len(chunks)
+        if self._pending_rows[base_path] >= self.batch_size:
+            self._flush_pending(base_path)
 
-        # Generate unique IDs for this file's chunks
-        # Use file_path + chunk_index for deterministic IDs
-        import hashlib
-        file_id_prefix = hashlib.sha256(file_path.encode('utf-8')).hexdigest()[:8]
-        ids = [f"{file_id_prefix}_{i}" for i in range(len(chunks))]
+    @contextmanager
+    def batch(self) -> Iterator["VectorStore"]:
+        """Coalesce store_file_chunks calls into fewer, larger ChromaDB writes.
 
-        # Ensure metadata includes file_path and file_hash
-        if metadatas is None:
-            metadatas = []
+        Pending chunks are flushed when the block exits (also on error),
+        and before any other operation on the same base_path.
 
-        for i, meta in enumerate(metadatas if metadatas else [{}] * len(chunks)):
-            meta["file_path"] = file_path
-            meta["file_hash"] = file_hash
-            if "chunk_index" not in meta:
-                meta["chunk_index"] = i
+        Example:
+            >>> with store.batch():
+            ...     for file_path, chunks, embeddings in files:
+            ...         store.store_file_chunks(base_path, file_path, ...)
+        """
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.flush_batch()
+
+    def begin_batch(self) -> None:
+        """Start holding back store_file_chunks writes (see batch())."""
+        self._batching = True
+
+    def flush_batch(self) -> None:
+        """Write all pending chunks, save the file index and stop batching."""
+        self._batching = False
+        for base_path in list(self._pending):
+            self._flush_pending(base_path)
+        self.save_file_index()
+
+    def _flush_pending(self, base_path: str) -> None:
+        """Write chunks held back for base_path, if any."""
+        files = self._pending.pop(base_path, None)
+        self._pending_rows.pop(base_path, None)
+        if files:
+            self.bulk_store_file_chunks(base_path, files)
+
+    def bulk_store_file_chunks(
+        self,
+        base_path: str,
+        files: List[FileChunks]
+    ) -> None:
+        """Store chunks for many files with as few ChromaDB writes as possible.
 
-        # Store in ChromaDB
-        collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=chunks,
-            metadatas=metadatas
-        )
+        All rows are combined and written with one collection.add call per
+        max_batch_size rows, instead of one call (and commit) per file.
+
+        Args:
+            base_path: Absolute path to project directory
+            files: List of (file_path, file_hash, chunks, embeddings, metadatas)
+                tuples, with the same meaning as the store_file_chunks arguments
+
+        Raises:
+            ValueError: If chunks and embeddings lengths don't match for a file
+        """
+        all_ids: List[str] = []
+        all_chunks: List[str] = []
+        all_embeddings: List[np.ndarray] = []
+        all_metadatas: List[Dict[str, Any]] = []
+        stored_hashes: Dict[str, str] = {}
+        stored_ids: Dict[str, List[str]] = {}
+
+        for file_path, file_hash, chunks, embeddings, metadatas in files:
+            if len(chunks) != len(embeddings):
+                raise ValueError(
+                    f"Chunks ({len(chunks)}) and embeddings ({len(embeddings)}) "
+                    "must have same length"
+                )
+
+            # Skip if no chunks (file too small or no content)
+            if len(chunks) == 0:
+                continue
+
+            # Generate unique IDs for this file's chunks
+            # Use file_path + chunk_index for deterministic IDs
+            id_prefix = _short_hash(file_path, 8) + "_"
+            ids = list(map(id_prefix.__add__, _INDEX_STRINGS[:len(chunks)]))
+            if len(chunks) > len(_INDEX_STRINGS):
+                ids.extend(map(id_prefix.__add__, map(str, range(len(_INDEX_STRINGS), len(chunks)))))
+
+            # Ensure metadata includes file_path and file_hash (fresh dicts,
+            # so the caller's metadata is never modified)
+            base = {"file_path": file_path, "file_hash": file_hash}
+            if not metadatas:
+                metadatas = [{**base, "chunk_index": i} for i in range(len(chunks))]
+            else:
+                metadatas = [
+                    {**meta, **base, "chunk_index": meta.get("chunk_index", i)}
+                    for i, meta in enumerate(metadatas)
+                ]
+
+            all_ids.extend(ids)
+            all_chunks.extend(chunks)
+            # No copy when a file's embeddings are already a contiguous float32 array
+            all_embeddings.append(np.ascontiguousarray(embeddings, dtype=np.float32))
+            all_metadatas.extend(metadatas)
+            stored_hashes[file_path] = file_hash
+            stored_ids[file_path] = ids
+
+        if not all_ids:
+            return
+
+        collection = self.get_or_create_collection(base_path)
+        # Stored embeddings are always unit length (see HNSW_SETTINGS)
+        embedding_array = _l2_normalize(np.concatenate(all_embeddings))
+
+        # Store in ChromaDB, split only where the client's batch limit requires
+        batch_size = self._max_batch_size()
+        for start in range(0, len(all_ids), batch_size):
+            end = start + batch_size
+            collection.add(
+                ids=all_ids[start:end],
+                embeddings=embedding_array[start:end],
+                documents=all_chunks[start:end],
+                metadatas=all_metadatas[start:end]
+            )
+        self._record_write(base_path)
+
+        if base_path in self._file_hashes:
+            self._file_hashes[base_path].update(stored_hashes)
+        if base_path in self._path_ids:
+            path_ids = self._path_ids[base_path]
+            for file_path, ids in stored_ids.items():
+                # add() keeps existing rows, so a file may gain ids but never loses them
+                path_ids[file_path] = list(dict.fromkeys(path_ids.get(file_path, []) + ids))
+
+    def _get_direct_index(self, base_path: str, collection) -> Optional[_DirectIndex]:
+        """In-memory copy of the collection, if it is small enough for exact search.
+
+        Only cosine / inner-product collections qualify (scores must match
+        the HNSW path).
+        """
+        direct_index = self._direct_indexes.get(base_path)
+        if direct_index is not None:
+            return direct_index
+
+        if _collection_space(collection) not in _COSINE_SPACES:
+            return None
+        if collection.count() >= self.direct_search_max_chunks:
+            return None
+
+        direct_index = _DirectIndex(collection, INDEX_SCAN_PAGE_SIZE)
+        self._direct_indexes[base_path] = direct_index
+        return direct_index
+
+    def _max_batch_size(self) -> int:
+        """Largest number of rows ChromaDB accepts in a single add()."""
+        if self._batch_size_limit is None:
+            get_max_batch_size = getattr(self.client, "get_max_batch_size", None)
+            if get_max_batch_size is not None:
+                self._batch_size_limit = int(get_max_batch_size())
+            else:
+                # Older chromadb clients expose it as a property
+                self._batch_size_limit = int(self.client.max_batch_size)  # type: ignore[attr-defined]
+        return self._batch_size_limit
 
     def get_chunks_by_indices(
         self,
@@ -321,19 +1166,39 @@ class VectorStore:
         Returns:
             Dict mapping chunk_index → chunk_content
         """
-        collection_name = self.get_collection_name(base_path)
-
-        try:
-            collection = self.client.get_collection(name=collection_name)
-        except Exception:
+        self._flush_pending(base_path)
+        chunk_ids = self._file_chunk_ids(base_path, file_path)
+        if not chunk_ids:
             return {}
 
-        # Get all chunks for this file
-        results = collection.get(
-            where={"file_path": file_path},
-            include=["documents", "metadatas"]
-        )
+        wanted = set(chunk_indices)
+        collection = self._get_existing_collection(base_path)
+
+        # Chunk IDs end in the chunk's position, which is its chunk_index
+        # unless the caller supplied its own; fetch those IDs directly
+        id_prefix = _short_hash(file_path, 8) + "_"
+        stored_ids = set(chunk_ids)
+        direct_ids = [
+            chunk_id for chunk_id in (f"{id_prefix}{i}" for i in sorted(wanted))
+            if chunk_id in stored_ids
+        ]
+        chunk_map = self._chunks_with_indices(collection, direct_ids, wanted)
+
+        if len(chunk_map) < len(wanted):
+            # Some indices are not at their position: check the file's other chunks
+            fetched = set(direct_ids)
+            remaining = [chunk_id for chunk_id in chunk_ids if chunk_id not in fetched]
+            chunk_map.update(self._chunks_with_indices(collection, remaining, wanted))
 
+        return chunk_map
+
+    @staticmethod
+    def _chunks_with_indices(collection, chunk_ids: List[str], wanted: set) -> Dict[int, str]:
+        """Fetch chunks by ID and keep those whose chunk_index is wanted."""
+        if not chunk_ids:
+            return {}
+
+        results = collection.get(ids=chunk_ids, include=["documents", "metadatas"])
         if not results or not results.get("documents"):
             return {}
 
@@ -342,9 +1207,9 @@ class VectorStore:
         documents = results["documents"]
         metadatas = results["metadatas"] if results.get("metadatas") else [{}] * len(documents)
 
-        for doc, metadata in zip(documents, metadatas):
-            idx = metadata.get("chunk_index", -1)
-            if idx in chunk_indices:
+        for doc, metadata in zip(documents, metadatas, strict=True):
+            idx = (metadata or {}).get("chunk_index", -1)
+            if idx in wanted:
                 chunk_map[idx] = doc
 
         return chunk_map
@@ -358,6 +1223,11 @@ class VectorStore:
     ) -> List[SearchResult]:
         """Search for similar chunks, optionally filtered by file paths.
 
+        With the query cache enabled (query_cache_size), results for a query
+        embedding nearly identical to a recent one (see query_cache_threshold)
+        are returned from memory without querying ChromaDB. Collections smaller than direct_search_max_chunks are
+        searched exactly against an in-memory copy of their embeddings.
+
         Args:
             base_path: Absolute path to project directory
             query_embedding: Query embedding vector
@@ -367,47 +1237,193 @@ class VectorStore:
         Returns:
             List of SearchResult objects, sorted by relevance
         """
-        collection_name = self.get_collection_name(base_path)
+        self._flush_pending(base_path)
+        cache_scope = (base_path, tuple(file_paths) if file_paths is not None else None, top_k)
+        if self._query_cache is not None:
+            cached = self._query_cache.get(cache_scope, query_embedding)
+            if cached is not None:
+                return cached
+
+        raw = self._search_raw(base_path, query_embedding, file_paths, top_k)
+        if raw is None:
+            return []
+        search_results = _to_search_results(raw)
 
-        try:
-            collection = self.client.get_collection(name=collection_name)
-        except Exception:
+        if self._query_cache is not None:
+            self._query_cache.put(cache_scope, query_embedding, search_results)
+
+        return search_results
+
+    def search_bulk(
+        self,
+        base_path: str,
+        query_embedding: List[float],
+        file_paths: Optional[List[str]] = None,
+        top_k: int = 5
+    ) -> RawResults:
+        """Search like search(), returning hits as parallel arrays.
+
+        Meant for callers that post-process many hits (e.g. re-ranking or
+        hybrid scoring): no SearchResult objects are built, and scores come
+        back as one array. Bypasses the query cache.
+
+        Args:
+            base_path: Absolute path to project directory
+            query_embedding: Query embedding vector
+            file_paths: Optional list of file paths to search within (None = search all)
+            top_k: Number of results to return
+
+        Returns:
+            (scores, documents, metadatas), sorted by relevance: a float32
+            array of similarity scores plus the matching lists
+
+        Example:
+            >>> scores, documents, metadatas = store.search_bulk(base_path, query, top_k=50)
+            >>> combined = 0.7 * scores + 0.3 * keyword_scores
+        """
+        self._flush_pending(base_path)
+        raw = self._search_raw(base_path, query_embedding, file_paths, top_k)
+        return raw if raw is not None else _empty_raw_results()
+
+    def search_many(
+        self,
+        base_path: str,
+        query_embeddings: np.ndarray | List[List[float]],
+        file_paths: Optional[List[str]] = None,
+        top_k: int = 5
+    ) -> List[List[SearchResult]]:
+        """Search for several queries at once (e.g. multi-query retrieval).
+
+        All queries go to ChromaDB in a single query() call, or through
+        one matrix product for collections searched in memory. Bypasses
+        the query cache.
+
+        Args:
+            base_path: Absolute path to project directory
+            query_embeddings: Query embedding vectors, one per row
+            file_paths: Optional list of file paths to search within (None = search all)
+            top_k: Number of results to return per query
+
+        Returns:
+            One list of SearchResult objects per query, each sorted by relevance
+        """
+        self._flush_pending(base_path)
+        if len(query_embeddings) == 0:
             return []
 
+        raw_results = self._search_raw_many(base_path, query_embeddings, file_paths, top_k)
+        if raw_results is None:
+            return [[] for _ in range(len(query_embeddings))]
+        return [_to_search_results(raw) for raw in raw_results]
+
+    def _search_raw(
+        self,
+        base_path: str,
+        query_embedding: List[float],
+        file_paths: Optional[List[str]],
+        top_k: int
+    ) -> Optional[RawResults]:
+        """Run one query against the in-memory copy or ChromaDB.
+
+        Returns:
+            Raw hits, or None if there is no collection for base_path
+        """
+        raw_results = self._search_raw_many(base_path, [query_embedding], file_paths, top_k)
+        return raw_results[0] if raw_results is not None else None
+
+    def _search_raw_many(
+        self,
+        base_path: str,
+        query_embeddings: np.ndarray | List[List[float]],
+        file_paths: Optional[List[str]],
+        top_k: int
+    ) -> Optional[List[RawResults]]:
+        """Run queries against the in-memory copy or ChromaDB, all at once.
+
+        Returns:
+            Raw hits for each query, or None if there is no collection for base_path
+        """
+        collection = self._get_existing_collection(base_path)
+        if collection is None:
+            return None
+
+        direct_index = (
+            self._get_direct_index(base_path, collection)
+            if self.direct_search_max_chunks > 0 else None
+        )
+        if direct_index is not None:
+            return direct_index.search_many(query_embeddings, file_paths, top_k)
+
         # Build where filter if file_paths provided
         where_filter = None
         if file_paths is not None:
             where_filter = {"file_path": {"$in": file_paths}}
 
-        # Query ChromaDB
+        queries = np.array(query_embeddings, dtype=np.float32, ndmin=2)
+        if _collection_space(collection) == "ip":
+            # Inner product is only cosine similarity between unit vectors
+            queries = _l2_normalize(queries)
+
+        # Query ChromaDB (one call for all queries)
         results = collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=queries,
             where=where_filter,
             n_results=top_k
         )
 
         # Parse results
-        search_results = []
-        if results["documents"] and len(results["documents"]) > 0:
-            documents = results["documents"][0]
-            distances = results["distances"][0]
-            metadatas = results["metadatas"][0] if results["metadatas"] else [{}] * len(documents)
-
-            for doc, distance, metadata in zip(documents, distances, metadatas):
-                # Convert distance to similarity score
-                # ChromaDB returns L2 distance, convert to similarity
-                score = 1.0 / (1.0 + distance)
-
-                search_results.append(
-                    SearchResult(
-                        content=doc,
-                        score=score,
-                        metadata=metadata,
-                        chunk_index=metadata.get("chunk_index", -1)
-                    )
-                )
+        return [
+            _raw_query_results(results, collection, query_index)
+            for query_index in range(len(queries))
+        ]
 
-        return search_results
+    def warmup(self, base_path: Optional[str] = None) -> int:
+        """Load search indexes into memory ahead of the first query.
+
+        Small collections get their in-memory copy for exact search built;
+        larger ones are sent a one-result query (using a stored embedding)
+        so ChromaDB loads their HNSW index from disk.
+
+        Args:
+            base_path: Collection to warm up (None = every collection with
+                this store's prefix)
+
+        Returns:
+            Number of collections warmed up
+        """
+        if base_path is not None:
+            base_paths = [base_path]
+        else:
+            try:
+                all_collections = self.client.list_collections()
+            except Exception:
+                return 0
+            base_paths = [
+                str(collection.metadata["base_path"])
+                for collection in all_collections
+                if collection.name.startswith(self.collection_prefix)
+                and (collection.metadata or {}).get("base_path")
+            ]
+
+        warmed = 0
+        for path in base_paths:
+            if not path:
+                continue
+            collection = self._get_existing_collection(path)
+            if collection is None:
+                continue
+
+            if self.direct_search_max_chunks > 0 and self._get_direct_index(path, collection):
+                warmed += 1
+                continue
+
+            probe = collection.get(limit=1, include=["embeddings"])
+            if probe is None or len(probe["ids"]) == 0:
+                continue
+            collection.query(query_embeddings=[probe["embeddings"][0]], n_results=1)
+            warmed += 1
+
+        return warmed
 
     # ========================================================================
     # Legacy Methods (Deprecated - kept for backward compatibility)
@@ -515,31 +1531,13 @@ class VectorStore:
         )
 
         # Parse results
-        search_results = []
-        if results["documents"] and len(results["documents"]) > 0:
-            documents = results["documents"][0]
-            distances = results["distances"][0]
-            metadatas = results["metadatas"][0] if results["metadatas"] else [{}] * len(documents)
-
-            for doc, distance, metadata in zip(documents, distances, metadatas):
-                # Convert distance to similarity score
-                # ChromaDB returns L2 distance, convert to similarity
-                score = 1.0 / (1.0 + distance)
-
-                search_results.append(
-                    SearchResult(
-                        content=doc,
-                        score=score,
-                        metadata=metadata,
-                        chunk_index=metadata.get("chunk_index", -1)
-                    )
-                )
-
-        return search_results
+        return _to_search_results(_raw_query_results(results, collection))
 
     def cleanup_old_collections(self, days_to_keep: int = 10) -> int:
         """Delete collections older than specified days.
 
+        Expired collections are deleted concurrently in a small thread pool.
+
         Args:
             days_to_keep: Number of days to keep collections (default: 10)
                 Collections created more than this many days ago will be deleted.
@@ -548,7 +1546,10 @@ class VectorStore:
             Number of collections deleted
         """
         cutoff_time = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
-        deleted_count = 0
+        # UTC ISO-8601 timestamps (as written by get_or_create_collection)
+        # sort lexicographically, so most can be compared without parsing
+        cutoff_iso = cutoff_time.isoformat()
+        expired: List[tuple[str, datetime]] = []
 
         try:
             all_collections = self.client.list_collections()
@@ -561,11 +1562,20 @@ class VectorStore:
                 continue
 
             # Check creation time from metadata
-            created_at_str = collection.metadata.get("created_at")
+            created_at_str = (collection.metadata or {}).get("created_at")
             if not created_at_str:
                 # No timestamp, skip
                 continue
 
+            # Fresh collections with a UTC timestamp are skipped unparsed
+            # (other offsets, and expired collections, are parsed below)
+            if (
+                isinstance(created_at_str, str)
+                and created_at_str.endswith("+00:00")
+                and created_at_str >= cutoff_iso
+            ):
+                continue
+
             try:
                 created_at = datetime.fromisoformat(created_at_str)
                 # Ensure timezone-aware comparison
@@ -573,12 +1583,36 @@ class VectorStore:
                     created_at = created_at.replace(tzinfo=timezone.utc)
 
                 if created_at < cutoff_time:
-                    self.client.delete_collection(collection.name)
-                    deleted_count += 1
-                    print(f"🗑️  Deleted old collection: {collection.name} (created {created_at.date()})")
+                    expired.append((collection.name, created_at))
             except (ValueError, Exception) as e:
                 # Invalid timestamp format, skip
                 print(f"⚠️  Could not parse timestamp for {collection.name}: {e}")
                 continue
 
+        if not expired:
+            return 0
+
+        def delete(name: str, created_at: datetime) -> bool:
+            # One failed deletion must not stop the others
+            try:
+                self.client.delete_collection(name)
+                (self.persist_directory / f"{name}.hashes.json").unlink(missing_ok=True)
+            except Exception as e:
+                print(f"⚠️  Could not delete collection {name}: {e}")
+                return False
+            print(f"🗑️  Deleted old collection: {name} (created {created_at.date()})")
+            return True
+
+        with ThreadPoolExecutor(max_workers=MAX_CLEANUP_WORKERS) as executor:
+            deleted_count = sum(executor.map(delete, *zip(*expired, strict=True)))
+
+        self._file_hashes.clear()
+        self._path_ids.clear()
+        self._dirty_file_indexes.clear()
+        self._write_generations.clear()
+        self._collections.clear()
+        self._direct_indexes.clear()
+        if self._query_cache is not None:
+            self._query_cache.clear()
+
         return deleted_count
@@ -0,0 +1,170 @@
+"""Tests for the high-level RAG API (with the embeddings request stubbed out)."""
+
+import asyncio
+import hashlib
+
+import numpy as np
+import pytest
+
+from justragit import RAG
+from justragit.core.embeddings import EmbeddingResult, VoyageEmbeddingService
+from justragit.core.vector_store import VectorStore
+
+
+def _paragraph(topic: int) -> str:
+    return " ".join(f"Sentence {i} of paragraph {topic} covers topic {topic}." for i in range(12))
+
+
+@pytest.fixture
+def embed_calls(tmp_path, monkeypatch):
+    """Stub the Voyage request; records the texts of each embeddings call."""
+    calls = []
+
+    async def fake_embed_shard(self, texts, input_type, output_dtype):
+        calls.append(list(texts))
+        vectors = []
+        for text in texts:
+            digest = np.frombuffer(hashlib.sha256(text.encode()).digest(), dtype=np.uint8)
+            vector = digest[:16].astype(np.float32) - 128
+            vectors.append(vector / np.linalg.norm(vector))
+        return EmbeddingResult(embeddings=np.array(vectors), model=self.model, total_tokens=0)
+
+    monkeypatch.setenv("CHROMADB_DIR", str(tmp_path / "chromadb"))
+    monkeypatch.setenv("VOYAGE_API_KEY", "test-key")
+    monkeypatch.setattr(VoyageEmbeddingService, "_embed_shard", fake_embed_shard)
+    return calls
+
+
+@pytest.fixture
+def docs(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("\n\n".join(_paragraph(k) for k in range(6)))
+    (docs / "b.md").write_text("# Bananas\n\nA small file about bananas.")
+    return docs
+
+
+def _index(docs, **kwargs) -> RAG:
+    """Initialize a RAG over docs (without the embedding cache) and close it."""
+    async def run():
+        rag = RAG(
+            str(docs),
+            whitelist=["**/*.md"],
+            chunk_min_tokens=40,
+            chunk_max_tokens=80,
+            cache_embeddings=False,
+            **kwargs
+        )
+        await rag.initialize()
+        await rag.close()
+        return rag
+
+    return asyncio.run(run())
+
+
+def _stored_chunks(rag: RAG, file_path: str) -> dict:
+    """Stored chunk text -> embedding for one file."""
+    collection = rag.vector_store.get_or_create_collection(rag._base_path_str)
+    stored = collection.get(where={"file_path": file_path}, include=["documents", "embeddings"])
+    return dict(zip(stored["documents"], stored["embeddings"]))
+
+
+def test_edit_embeds_only_changed_chunks(docs, embed_calls, monkeypatch):
+    """Test that an edit re-embeds only new chunks and reuses stored embeddings."""
+    before = _stored_chunks(_index(docs), "a.md")
+    assert len(before) > 2
+
+    events = []
+    original_get = VectorStore.get_chunk_embeddings
+    original_delete = VectorStore.delete_file_chunks
+
+    def get_chunk_embeddings(self, base_path, file_path):
+        events.append(("get", file_path))
+        return original_get(self, base_path, file_path)
+
+    def delete_file_chunks(self, base_path, file_path):
+        events.append(("delete", file_path))
+        return original_delete(self, base_path, file_path)
+
+    monkeypatch.setattr(VectorStore, "get_chunk_embeddings", get_chunk_embeddings)
+    monkeypatch.setattr(VectorStore, "delete_file_chunks", delete_file_chunks)
+
+    embed_calls.clear()
+    with open(docs / "a.md", "a") as f:
+        f.write("\n\nA brand new closing paragraph about something else entirely.")
+    after = _stored_chunks(_index(docs), "a.md")
+
+    new_chunks = after.keys() - before.keys()
+    assert new_chunks
+    embedded = [text for call in embed_calls for text in call]
+    assert len(embedded) == len(new_chunks)
+    # Unchanged chunks keep the embeddings stored before the edit
+    for text in after.keys() & before.keys():
+        np.testing.assert_allclose(after[text], before[text], atol=1e-6)
+    # Stored embeddings are fetched before the file's chunks are deleted
+    assert events == [("get", "a.md"), ("delete", "a.md")]
+
+
+def test_legacy_sha256_hash_is_retagged(docs, embed_calls):
+    """Test that files stored under a SHA-256 file_hash are re-tagged, not re-embedded."""
+    rag = _index(docs)
+    for file_path in rag.documents:
+        rag.vector_store.update_file_hash(
+            rag._base_path_str, file_path, rag._compute_legacy_file_hash(file_path)
+        )
+
+    embed_calls.clear()
+    rag = _index(docs)
+
+    assert embed_calls == []
+    assert rag.vector_store.get_file_hashes(rag._base_path_str) == {
+        file_path: rag._compute_file_hash(file_path) for file_path in rag.documents
+    }
+    # The new hashes are what a fresh store reads back
+    assert VectorStore().get_file_hashes(rag._base_path_str) == {
+        file_path: rag._compute_file_hash(file_path) for file_path in rag.documents
+    }
+
+
+def _search(docs, monkeypatch, query: str):
+    """Initialize a RAG over docs and search it; returns (rag, results, file_paths filter)."""
+    filters = []
+    original_search = VectorStore.search
+
+    def search(self, base_path, query_embedding, file_paths=None, top_k=5):
+        filters.append(file_paths)
+        return original_search(self, base_path, query_embedding, file_paths, top_k)
+
+    monkeypatch.setattr(VectorStore, "search", search)
+
+    async def run():
+        rag = RAG(str(docs), whitelist=["**/*.md"], chunk_min_tokens=40, chunk_max_tokens=80)
+        await rag.initialize()
+        results = await rag.search(query, top_k=20)
+        await rag.close()
+        return rag, results
+
+    rag, results = asyncio.run(run())
+    return rag, results, filters[-1]
+
+
+def test_search_without_deleted_files_skips_filter(docs, embed_calls, monkeypatch):
+    """Test that search runs unfiltered when the collection holds only active files."""
+    rag, results, file_paths = _search(docs, monkeypatch, "bananas")
+
+    assert rag._needs_path_filter is False
+    assert file_paths is None
+    assert {r.metadata["file_path"] for r in results} == {"a.md", "b.md"}
+
+
+def test_search_with_deleted_file_filters_it_out(docs, embed_calls, monkeypatch):
+    """Test that chunks of a file deleted from disk are excluded from search."""
+    _index(docs)
+    (docs / "a.md").unlink()
+
+    rag, results, file_paths = _search(docs, monkeypatch, "bananas")
+
+    assert rag._needs_path_filter is True
+    assert file_paths == ["b.md"]
+    assert results
+    assert {r.metadata["file_path"] for r in results} == {"b.md"}
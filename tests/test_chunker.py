@@ -5,7 +5,7 @@ Phase 2 will expand test coverage significantly.
 """
 
 import pytest
-from justragit.core.chunker import DocumentChunker, Chunk
+from justragit.core.chunker import DocumentChunker, Chunk, _assemble_chunks
 
 
 def test_chunker_initialization():
@@ -91,6 +91,44 @@ def test_chunk_metadata():
         assert chunk.end_char <= len(content)
 
 
+def test_chunk_offsets_are_contiguous():
+    """Test that each chunk starts where the previous one ended."""
+    chunker = DocumentChunker(
+        target_min_tokens=20,
+        target_max_tokens=40
+    )
+
+    content = "\n\n".join(f"Paragraph {i} has a few words in it." for i in range(30))
+
+    chunks = chunker.chunk_document(content, "test.md")
+
+    assert len(chunks) > 1
+    assert chunks[0].start_char == 0
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_char == previous.end_char
+
+
+def test_text_chunk_offsets_index_original_content():
+    """Test that text chunks point at their exact span of the document."""
+    chunker = DocumentChunker(
+        target_min_tokens=20,
+        target_max_tokens=40,
+        hard_max_tokens=60
+    )
+
+    long_paragraph = " ".join(f"Sentence number {i} is here." for i in range(40))
+    content = "Intro line.\n\n\n\n" + long_paragraph + "\n\n" + "\n\n".join(
+        f"Paragraph {i} has a few words in it." for i in range(20)
+    )
+
+    chunks = chunker.chunk_document(content, "test.md")
+
+    assert len(chunks) > 2
+    assert chunks[-1].end_char == len(content)
+    for chunk in chunks:
+        assert content[chunk.start_char:chunk.end_char].strip() == chunk.content
+
+
 def test_token_counting():
     """Test that token counting works."""
     chunker = DocumentChunker()
@@ -123,3 +161,130 @@ def test_very_short_content():
     chunks = chunker.chunk_document(content, "short.txt")
 
     assert len(chunks) >= 0  # Should handle gracefully
+
+
+def test_count_tokens_batch_matches_count_tokens():
+    """Test that batched token counts match one-at-a-time counts."""
+    chunker = DocumentChunker()
+
+    texts = ["Hello, world!", "", "def f():\n    return 1\n", "<|endoftext|> is plain text here"]
+
+    assert chunker.count_tokens_batch(texts) == [chunker.count_tokens(t) for t in texts]
+
+
+def test_split_code_on_definitions():
+    """Test that code is split at def/class/function boundaries."""
+    chunker = DocumentChunker()
+
+    code = "import os\ndef a():\n    pass\nclass B:\n    pass\nasync function c() {}\n"
+
+    segments, token_counts = chunker._split_code(code)
+
+    assert segments == [
+        "import os", "\ndef a():\n    pass", "\nclass B:\n    pass", "\nasync function c() {}\n"
+    ]
+    assert "".join(segments) == code
+    assert len(token_counts) == len(segments)
+
+
+def test_code_chunk_offsets_index_original_content():
+    """Test that code chunks keep their line breaks and point at their exact span."""
+    chunker = DocumentChunker(
+        target_min_tokens=20,
+        target_max_tokens=40,
+        hard_max_tokens=60
+    )
+
+    methods = "\n".join(
+        f"public void method{i}() {{\n    call({i});\n}}\n" for i in range(15)
+    )
+    long_function = "\n".join(f"    value_{i} = compute({i})" for i in range(40))
+    content = f"class Service {{\n\n{methods}}}\n\ndef long():\n{long_function}\n\n\n"
+
+    chunks = chunker.chunk_document(content, "Service.java")
+
+    assert len(chunks) > 2
+    assert all("}public" not in chunk.content for chunk in chunks)
+    assert "".join(content[c.start_char:c.end_char] for c in chunks) == content
+    for chunk in chunks:
+        assert content[chunk.start_char:chunk.end_char].strip() == chunk.content
+
+
+def test_small_document_is_single_chunk():
+    """Test that a document under target_max_tokens is returned whole."""
+    chunker = DocumentChunker(
+        target_min_tokens=100,
+        target_max_tokens=200
+    )
+
+    content = "  First paragraph.\n\nSecond paragraph.\n"
+    chunks = chunker.chunk_document(content, "small.md")
+
+    assert len(chunks) == 1
+    assert chunks[0].content == content.strip()
+    assert chunks[0].start_char == 0
+    assert chunks[0].end_char == len(content)
+    assert chunks[0].token_count == chunker.count_tokens(content)
+
+
+def test_whitespace_only_content_has_no_chunks():
+    """Test that blank documents produce no chunks."""
+    chunker = DocumentChunker()
+
+    assert chunker.chunk_document("  \n\n \n", "blank.md") == []
+
+
+def test_split_sentences():
+    """Test sentence boundaries on terminators before capitals or newlines."""
+    chunker = DocumentChunker()
+
+    text = "One sentence. Another one! Is this e.g. lowercase? Yes.\nlast line"
+
+    assert chunker._split_sentences(text) == [
+        "One sentence. ",
+        "Another one! ",
+        "Is this e.g. lowercase? ",
+        "Yes.\n",
+        "last line",
+    ]
+
+
+def test_assemble_chunks_boundaries():
+    """Test grouping segments by token counts."""
+    # Closes once a chunk reaches 10 tokens, never exceeds 25
+    boundaries = _assemble_chunks([4, 4, 4, 20, 30, 1], target_min_tokens=10, hard_max_tokens=25)
+
+    assert boundaries == [(0, 3, 12), (3, 4, 20), (4, 5, 30), (5, 6, 1)]
+
+
+def test_duplicate_content_is_chunked_once(monkeypatch):
+    """Identical documents reuse the cached chunks instead of re-splitting."""
+    chunker = DocumentChunker(target_min_tokens=100, target_max_tokens=200)
+    content = "\n\n".join(f"Paragraph {i}. " + "word " * 200 for i in range(8))
+    first = chunker.chunk_document(content, "a.md")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("duplicate content was split again")
+
+    monkeypatch.setattr(chunker, "_split_text", fail)
+    assert chunker.chunk_document(content, "copy/a.md") == first
+
+    # The same text treated as code is a different cache entry
+    monkeypatch.undo()
+    assert chunker.chunk_document(content, "a.py")
+    assert len(chunker._chunk_cache) == 2
+
+
+def test_cached_chunks_are_not_shared_between_calls():
+    """Test that changing returned chunks does not change later results for the same content."""
+    chunker = DocumentChunker(target_min_tokens=100, target_max_tokens=200)
+    content = "\n\n".join(f"Paragraph {i}. " + "word " * 200 for i in range(8))
+    first = chunker.chunk_document(content, "a.md")
+    expected = [(chunk.chunk_index, chunk.content) for chunk in first]
+
+    for chunk in first:
+        chunk.chunk_index += 100
+        chunk.content = "changed"
+
+    again = chunker.chunk_document(content, "copy/a.md")
+    assert [(chunk.chunk_index, chunk.content) for chunk in again] == expected
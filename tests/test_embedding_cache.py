@@ -0,0 +1,62 @@
+"""Tests for EmbeddingCache."""
+
+import pytest
+from justragit.core.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_roundtrip(cache):
+    """Test that stored embeddings come back (at float16 precision)."""
+    key = cache.make_key("voyage-3-large", "query", "hello")
+    assert cache.get(key) is None
+
+    cache.set(key, [0.5, -0.25, 0.125])
+
+    assert cache.get(key) == [0.5, -0.25, 0.125]
+
+
+def test_key_depends_on_all_fields():
+    """Test that model, input type, dtype and text all affect the key."""
+    base = EmbeddingCache.make_key("m", "query", "text")
+    assert base != EmbeddingCache.make_key("m2", "query", "text")
+    assert base != EmbeddingCache.make_key("m", "document", "text")
+    assert base != EmbeddingCache.make_key("m", "query", "text", "int8")
+    assert base != EmbeddingCache.make_key("m", "query", "other")
+
+
+def test_evicts_least_recently_used(cache):
+    """Test that the cache stays within max_entries."""
+    cache.set("a", [1.0])
+    cache.set("b", [2.0])
+    cache.get("a")  # a is now more recent than b
+    cache.set("c", [3.0])
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+
+
+def test_clear(cache):
+    """Test clearing the cache."""
+    cache.set("a", [1.0])
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_get_many_and_set_many(tmp_path):
+    """Test batched lookups return vectors in key order with None for misses."""
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    cache.set_many([("a", [1.0, 2.0]), ("b", [3.0, 4.0])])
+
+    vectors = cache.get_many(["b", "missing", "a"])
+
+    assert vectors[0].tolist() == [3.0, 4.0]
+    assert vectors[1] is None
+    assert vectors[2].tolist() == [1.0, 2.0]
+    cache.close()
@@ -0,0 +1,165 @@
+"""Tests for embedding helpers."""
+
+import asyncio
+import json
+
+import httpx
+import numpy as np
+
+from justragit.core.embedding_cache import EmbeddingCache
+from justragit.core.embeddings import VoyageEmbeddingService, pack_batches
+
+
+def test_pack_batches_respects_token_budget():
+    """Test that batches never exceed the token budget."""
+    batches = pack_batches([40, 40, 40, 40, 40], max_items=128, max_tokens=100)
+
+    assert batches == [slice(0, 2), slice(2, 4), slice(4, 5)]
+
+
+def test_pack_batches_respects_item_limit():
+    """Test that batches never exceed the item limit."""
+    batches = pack_batches([1] * 5, max_items=2, max_tokens=1000)
+
+    assert batches == [slice(0, 2), slice(2, 4), slice(4, 5)]
+
+
+def test_pack_batches_oversized_item_gets_own_batch():
+    """Test that a single text over the budget is still sent."""
+    batches = pack_batches([10, 500, 10], max_items=128, max_tokens=100)
+
+    assert batches == [slice(0, 1), slice(1, 2), slice(2, 3)]
+
+
+def test_pack_batches_covers_input_in_order():
+    """Test that batches cover every text exactly once, in order."""
+    token_counts = [7, 93, 12, 60, 1, 1, 88, 40, 40, 40]
+    batches = pack_batches(token_counts, max_items=3, max_tokens=100)
+
+    covered = [i for batch in batches for i in range(len(token_counts))[batch]]
+    assert covered == list(range(len(token_counts)))
+    for batch in batches:
+        assert len(token_counts[batch]) <= 3
+        assert sum(token_counts[batch]) <= 100 or len(token_counts[batch]) == 1
+
+
+def test_pack_batches_empty():
+    """Test that no texts means no batches."""
+    assert pack_batches([]) == []
+
+
+def _service_with_handler(handler, **kwargs):
+    """Build a service whose HTTP client is answered by handler."""
+    service = VoyageEmbeddingService(api_key="test", **kwargs)
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+def _service_returning(embeddings):
+    """Build a service whose HTTP client answers with the given embeddings."""
+    def handler(request):
+        return httpx.Response(200, json={
+            "data": [{"embedding": e} for e in embeddings],
+            "model": "voyage-3-large",
+            "usage": {"total_tokens": 3},
+        })
+
+    return _service_with_handler(handler)
+
+
+def test_embed_texts_returns_contiguous_array():
+    """Test that embeddings come back as one (n, dim) float32 array."""
+    service = _service_returning([[0.5, 1.0], [2.0, 4.0]])
+
+    result = asyncio.run(service.embed_texts(["a", "b"]))
+
+    assert result.embeddings.shape == (2, 2)
+    assert result.embeddings.dtype == np.float32
+
+
+def test_embed_texts_float16_dtype():
+    """Test that the service can hold float embeddings as float16."""
+    service = _service_returning([[0.5, 1.0]])
+    service.dtype = "float16"
+
+    result = asyncio.run(service.embed_texts(["a"]))
+
+    assert result.embeddings.dtype == np.float16
+    assert result.embeddings.tolist() == [[0.5, 1.0]]
+
+
+def test_embed_texts_int8_keeps_int8_dtype():
+    """Test that int8 embeddings are not widened to floats."""
+    service = _service_returning([[-128, 127]])
+
+    result = asyncio.run(service.embed_texts(["a"], output_dtype="int8"))
+
+    assert result.embeddings.dtype == np.int8
+    assert result.embeddings.tolist() == [[-128, 127]]
+
+
+def test_embed_texts_shards_requests_in_order():
+    """Test that large inputs are split into requests and reassembled in order."""
+    requests = []
+
+    def handler(request):
+        texts = json.loads(request.content)["input"]
+        requests.append(texts)
+        return httpx.Response(200, json={
+            "data": [{"embedding": [float(t), 0.0]} for t in texts],
+            "model": "voyage-3-large",
+            "usage": {"total_tokens": len(texts)},
+        })
+
+    service = _service_with_handler(handler, max_texts_per_request=2, max_parallel=2)
+    texts = [str(i) for i in range(5)]
+
+    result = asyncio.run(service.embed_texts(texts, token_counts=[1] * 5))
+
+    assert len(requests) == 3
+    assert result.embeddings[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert result.total_tokens == 5
+
+
+def test_embed_texts_retries_server_errors(monkeypatch):
+    """Test that a transient 503 is retried instead of failing the request."""
+    monkeypatch.setattr(VoyageEmbeddingService, "_retry_delay", staticmethod(lambda r, a: 0.0))
+    responses = [
+        httpx.Response(503, text="unavailable"),
+        httpx.Response(200, json={
+            "data": [{"embedding": [1.0, 2.0]}],
+            "model": "voyage-3-large",
+            "usage": {"total_tokens": 1},
+        }),
+    ]
+
+    service = _service_with_handler(lambda request: responses.pop(0))
+
+    result = asyncio.run(service.embed_texts(["a"]))
+
+    assert result.embeddings.tolist() == [[1.0, 2.0]]
+    assert responses == []
+
+
+def test_embed_texts_sends_only_cache_misses(tmp_path):
+    """Test that cached texts are served locally and only misses hit the API."""
+    requests = []
+
+    def handler(request):
+        texts = json.loads(request.content)["input"]
+        requests.append(texts)
+        return httpx.Response(200, json={
+            "data": [{"embedding": [float(len(t)), 1.0]} for t in texts],
+            "model": "voyage-3-large",
+            "usage": {"total_tokens": len(texts)},
+        })
+
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    service = _service_with_handler(handler, cache=cache)
+
+    asyncio.run(service.embed_texts(["a", "bb"]))
+    result = asyncio.run(service.embed_texts(["bb", "ccc", "a"]))
+
+    assert requests == [["a", "bb"], ["ccc"]]
+    assert result.embeddings[:, 0].tolist() == [2.0, 3.0, 1.0]
+    cache.close()
@@ -0,0 +1,148 @@
+"""Tests for FileDiscovery."""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from justragit.core.file_discovery import FileDiscovery
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        "README.md": "# Project\n",
+        "docs/guide.md": "Guide\r\nwith CRLF\r\n",
+        "docs/archive/old.md": "Old\n",
+        "src/app.py": "print('hi')\n",
+        "src/build/generated.py": "x = 1\n",
+        ".hidden/secret.md": "hidden\n",
+        "image.png": "not really an image",
+    }
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content.encode("utf-8"))
+    (tmp_path / ".gitignore").write_text("build/\n")
+    return tmp_path
+
+
+def test_discover_applies_filters(project):
+    """Test whitelist, blacklist, gitignore and hidden-file filtering."""
+    discovery = FileDiscovery(
+        str(project),
+        whitelist_paths=["**/*.md", "src/"],
+        blacklist_paths=["*/archive/*"],
+    )
+
+    documents = discovery.discover()
+
+    assert sorted(documents) == ["README.md", "docs/guide.md", "src/app.py"]
+    assert documents["docs/guide.md"] == "Guide\nwith CRLF\n"
+    assert set(discovery.file_hashes) == set(documents)
+
+
+def test_discover_async_matches_discover(project):
+    """Test that async discovery loads the same files and hashes."""
+    discovery = FileDiscovery(str(project), whitelist_paths=["**/*.md", "src/"])
+
+    documents = discovery.discover()
+    hashes = dict(discovery.file_hashes)
+    async_documents = asyncio.run(discovery.discover_async())
+
+    assert async_documents == documents
+    assert discovery.file_hashes == hashes
+
+
+def test_whitelist_patterns_keep_glob_anchoring(project):
+    """Test that patterns without "**" only match at their own level."""
+    discovery = FileDiscovery(str(project), whitelist_paths=["*.md", "src/*.py"])
+
+    assert sorted(discovery.discover()) == ["README.md", "src/app.py"]
+
+
+def test_blacklisted_directory_is_skipped(project):
+    """Test that blacklisted directories are excluded with everything below them."""
+    discovery = FileDiscovery(
+        str(project),
+        whitelist_paths=["**/*.md"],
+        blacklist_paths=["*/archive/"],
+    )
+
+    assert sorted(discovery.discover()) == ["README.md", "docs/guide.md"]
+
+
+@pytest.mark.parametrize("pattern", ["**/archive/", "*/archive/"])
+def test_blacklisted_directory_is_skipped_at_any_depth(project, pattern):
+    """Test that directory patterns exclude nested directories, not just depth one."""
+    for rel_path in ("archive/top.md", "docs/v1/archive/deep.md", "a/b/c/archive/deeper.md"):
+        path = project / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("archived\n")
+
+    discovery = FileDiscovery(str(project), whitelist_paths=["**/*.md"], blacklist_paths=[pattern])
+
+    assert sorted(discovery.discover()) == ["README.md", "docs/guide.md"]
+
+
+def test_large_file_is_read_and_hashed_like_small_files(tmp_path):
+    """Test that memory-mapped reads match plain reads."""
+    text = "line of text\r\n" * 10_000  # Over the mmap threshold
+    (tmp_path / "big.txt").write_bytes(text.encode("utf-8"))
+    (tmp_path / "small.txt").write_bytes(text[:100].encode("utf-8"))
+
+    discovery = FileDiscovery(str(tmp_path), whitelist_paths=["*.txt"])
+    documents = discovery.discover()
+
+    assert documents["big.txt"] == text.replace("\r\n", "\n")
+    assert discovery.file_hashes["big.txt"] == hashlib.blake2b(
+        text.encode("utf-8"), digest_size=16
+    ).hexdigest()
+    assert discovery.file_hashes["small.txt"] == hashlib.blake2b(
+        text[:100].encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def _write_text_pdf(path, num_pages: int) -> None:
+    """Write a PDF whose page i reads "Hello page i"."""
+    from pypdf import PdfWriter
+    from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for i in range(1, num_pages + 1):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td (Hello page {i}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_long_pdf_is_extracted_in_worker_processes(tmp_path, monkeypatch):
+    """Test that discovery threads hand long PDFs to the extraction process pool."""
+    pdf_extractor = pytest.importorskip("justragit.core.pdf_extractor")
+    if pdf_extractor.pymupdf is not None:
+        pytest.skip("PyMuPDF extracts in-process")
+
+    monkeypatch.setattr(pdf_extractor, "PARALLEL_EXTRACTION_MIN_PAGES", 4)
+    monkeypatch.setattr(pdf_extractor.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(pdf_extractor, "_extraction_pool", None)
+    _write_text_pdf(tmp_path / "long.pdf", 6)
+
+    try:
+        documents = FileDiscovery(str(tmp_path), whitelist_paths=["**/*.pdf"]).discover()
+        assert pdf_extractor._extraction_pool is not None
+    finally:
+        if pdf_extractor._extraction_pool is not None:
+            pdf_extractor._extraction_pool.shutdown()
+
+    pages = documents["long.pdf"].split("\n\n")
+    assert pages == [f"--- Page {i} ---\nHello page {i}" for i in range(1, 7)]
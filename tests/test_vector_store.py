@@ -0,0 +1,542 @@
+"""Tests for VectorStore."""
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from justragit.core.vector_store import SearchResult, VectorStore, format_results
+
+BASE_PATH = "/project"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return VectorStore(persist_directory=str(tmp_path / "chromadb"))
+
+
+def _unit(i: int, dim: int = 8) -> list[float]:
+    vector = [0.0] * dim
+    vector[i % dim] = 1.0
+    return vector
+
+
+def _file(file_path: str, file_hash: str, n: int, offset: int = 0):
+    chunks = [f"{file_path} chunk {i}" for i in range(n)]
+    embeddings = [_unit(offset + i) for i in range(n)]
+    metadatas = [{"chunk_index": i} for i in range(n)]
+    return (file_path, file_hash, chunks, embeddings, metadatas)
+
+
+def test_bulk_store_and_file_hashes(store):
+    """Test storing several files at once."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+
+    assert store.get_file_hashes(BASE_PATH) == {"a.md": "ha", "b.md": "hb"}
+
+
+def test_search_ranks_closest_first(store):
+    """Test that search returns the most similar chunk first."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+
+    results = store.search(BASE_PATH, _unit(4), top_k=2)
+
+    assert results[0].content == "b.md chunk 1"
+    assert results[0].score > results[1].score
+
+
+def test_search_filters_by_file_path(store):
+    """Test restricting search to a subset of files."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+
+    results = store.search(BASE_PATH, _unit(4), file_paths=["a.md"], top_k=5)
+
+    assert {r.metadata["file_path"] for r in results} == {"a.md"}
+
+
+def test_delete_file_chunks(store):
+    """Test deleting one file's chunks."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+
+    assert store.delete_file_chunks(BASE_PATH, "a.md") == 3
+    assert store.get_file_hashes(BASE_PATH) == {"b.md": "hb"}
+
+
+def test_mismatched_lengths_raise(store):
+    """Test that chunk/embedding count mismatches are rejected."""
+    with pytest.raises(ValueError):
+        store.store_file_chunks(BASE_PATH, "a.md", "ha", ["x", "y"], [_unit(0)])
+
+
+def test_file_hashes_cache_tracks_writes(store):
+    """Test that cached file hashes stay in sync with stores and deletes."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3)])
+    assert store.get_file_hashes(BASE_PATH) == {"a.md": "ha"}
+
+    store.bulk_store_file_chunks(BASE_PATH, [_file("b.md", "hb", 2, 3)])
+    store.update_file_hash(BASE_PATH, "a.md", "ha2")
+    assert store.get_file_hashes(BASE_PATH) == {"a.md": "ha2", "b.md": "hb"}
+
+    store.delete_file_chunks(BASE_PATH, "b.md")
+    assert store.get_file_hashes(BASE_PATH) == {"a.md": "ha2"}
+
+
+@pytest.fixture
+def cached_store(tmp_path):
+    return VectorStore(persist_directory=str(tmp_path / "chromadb"), query_cache_size=16)
+
+
+def test_query_cache_is_off_by_default(store, monkeypatch):
+    """Test that a near-identical query still queries ChromaDB by default."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3)])
+    store.search(BASE_PATH, _unit(1), top_k=1)
+
+    calls = []
+    original_search_raw = store._search_raw
+    monkeypatch.setattr(
+        store, "_search_raw", lambda *args: calls.append(args) or original_search_raw(*args)
+    )
+    near = _unit(1)
+    near[0] = 0.01
+    store.search(BASE_PATH, near, top_k=1)
+
+    assert len(calls) == 1
+
+
+def test_query_cache_returns_copies(cached_store):
+    """Test that changing returned results does not change later cached answers."""
+    cached_store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3)])
+    first = cached_store.search(BASE_PATH, _unit(1), top_k=2)
+    first[0].metadata["file_path"] = "changed.md"
+    first[0].chunk_index = 99
+    first.clear()
+
+    again = cached_store.search(BASE_PATH, _unit(1), top_k=2)
+    assert len(again) == 2
+    assert again[0].metadata["file_path"] == "a.md"
+    assert again[0].chunk_index == 1
+
+
+def test_query_cache_reuses_results_for_near_duplicate_queries(cached_store, monkeypatch):
+    """Test that a near-identical query is answered without querying ChromaDB."""
+    store = cached_store
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+    first = store.search(BASE_PATH, _unit(4), top_k=2)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("collection was queried")
+
+    monkeypatch.setattr(store.client, "get_collection", fail)
+    near = _unit(4)
+    near[0] = 0.01
+    assert store.search(BASE_PATH, near, top_k=2) == first
+
+
+def test_query_cache_invalidated_by_writes(cached_store):
+    """Test that storing or deleting chunks drops cached results."""
+    store = cached_store
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3)])
+    assert store.search(BASE_PATH, _unit(4), top_k=1)[0].metadata["file_path"] == "a.md"
+
+    store.bulk_store_file_chunks(BASE_PATH, [_file("b.md", "hb", 2, 3)])
+    assert store.search(BASE_PATH, _unit(4), top_k=1)[0].content == "b.md chunk 1"
+
+    store.delete_file_chunks(BASE_PATH, "b.md")
+    assert store.search(BASE_PATH, _unit(4), top_k=1)[0].metadata["file_path"] == "a.md"
+
+
+def test_batch_coalesces_store_calls(tmp_path, monkeypatch):
+    """Test that store_file_chunks calls inside batch() share collection.add calls."""
+    store = VectorStore(persist_directory=str(tmp_path / "chromadb"), batch_size=4)
+    add_sizes = []
+    original_add = store.bulk_store_file_chunks
+
+    def counting_bulk_store(base_path, files):
+        add_sizes.append(sum(len(f[2]) for f in files))
+        return original_add(base_path, files)
+
+    monkeypatch.setattr(store, "bulk_store_file_chunks", counting_bulk_store)
+
+    with store.batch():
+        for i in range(5):
+            store.store_file_chunks(BASE_PATH, *_file(f"{i}.md", f"h{i}", 1, i))
+        # Reads see pending chunks
+        assert len(store.get_file_hashes(BASE_PATH)) == 5
+        store.store_file_chunks(BASE_PATH, *_file("5.md", "h5", 1, 5))
+
+    assert add_sizes == [4, 1, 1]
+    assert len(store.get_file_hashes(BASE_PATH)) == 6
+
+
+def test_path_index_avoids_metadata_scans(store, monkeypatch):
+    """Test that per-file operations use the file_path -> ids index."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+    store.get_file_hashes(BASE_PATH)
+
+    collection = store.get_or_create_collection(BASE_PATH)
+    original_get = type(collection).get
+
+    def get_without_where(self, *args, **kwargs):
+        assert kwargs.get("where") is None and kwargs.get("ids"), "metadata scan"
+        return original_get(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(collection), "get", get_without_where)
+
+    assert store.get_chunks_by_indices(BASE_PATH, "b.md", [1]) == {1: "b.md chunk 1"}
+    assert store.update_file_hash(BASE_PATH, "a.md", "ha2") == 3
+    assert store.delete_file_chunks(BASE_PATH, "b.md") == 2
+    assert store.get_file_hashes(BASE_PATH) == {"a.md": "ha2"}
+
+
+def test_collection_handle_is_cached(store, monkeypatch):
+    """Test that the collection is resolved through the client only once."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3)])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("collection was resolved again")
+
+    monkeypatch.setattr(store.client, "get_collection", fail)
+    monkeypatch.setattr(store.client, "get_or_create_collection", fail)
+
+    store.delete_file_chunks(BASE_PATH, "a.md")
+    store.bulk_store_file_chunks(BASE_PATH, [_file("b.md", "hb", 2)])
+    assert store.get_file_hashes(BASE_PATH) == {"b.md": "hb"}
+
+
+def test_file_hashes_loaded_across_pages(tmp_path, monkeypatch):
+    """Test that the file index is built correctly from several pages."""
+    import justragit.core.vector_store as vector_store_module
+
+    monkeypatch.setattr(vector_store_module, "INDEX_SCAN_PAGE_SIZE", 2)
+    writer = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    writer.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+
+    reader = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    assert reader.get_file_hashes(BASE_PATH) == {"a.md": "ha", "b.md": "hb"}
+    assert reader.delete_file_chunks(BASE_PATH, "a.md") == 3
+
+
+def test_search_scores_are_cosine_similarity(store):
+    """Test that an exact match scores 1.0 and an orthogonal chunk 0.0."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3)])
+
+    results = store.search(BASE_PATH, _unit(1), top_k=2)
+
+    assert results[0].score == pytest.approx(1.0, abs=1e-5)
+    assert results[1].score == pytest.approx(0.0, abs=1e-5)
+
+
+def test_format_results_matches_to_string():
+    """Test that format_results joins each result's default formatting."""
+    results = [
+        SearchResult(content=f"chunk {i}", score=0.5 + i / 10, metadata={"file_path": f"{i}.md"}, chunk_index=i)
+        for i in range(3)
+    ]
+
+    assert format_results(results) == "\n\n".join(r.to_string() for r in results)
+    assert format_results(results, "{file_path}") == "0.md\n\n1.md\n\n2.md"
+    assert format_results([]) == ""
+
+
+def test_store_file_chunks_accepts_arrays(store):
+    """Test storing embeddings given as a NumPy array."""
+    import numpy as np
+
+    file_path, file_hash, chunks, embeddings, metadatas = _file("a.md", "ha", 3)
+    store.store_file_chunks(BASE_PATH, file_path, file_hash, chunks, np.array(embeddings, dtype=np.float64), metadatas)
+
+    assert store.search(BASE_PATH, _unit(2), top_k=1)[0].content == "a.md chunk 2"
+    with pytest.raises(ValueError):
+        store.store_file_chunks(BASE_PATH, "b.md", "hb", ["x"], np.zeros((2, 8), dtype=np.float32))
+
+
+def test_direct_search_matches_hnsw(tmp_path):
+    """Test that exact in-memory search agrees with the HNSW index."""
+    files = [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)]
+    direct = VectorStore(persist_directory=str(tmp_path / "direct"), query_cache_size=0)
+    hnsw = VectorStore(persist_directory=str(tmp_path / "hnsw"), query_cache_size=0, direct_search_max_chunks=0)
+    direct.bulk_store_file_chunks(BASE_PATH, files)
+    hnsw.bulk_store_file_chunks(BASE_PATH, files)
+
+    query = [0.1, 0.2, 0.0, 0.9, 0.3, 0.0, 0.0, 0.0]
+    for file_paths in (None, ["a.md"]):
+        expected = hnsw.search(BASE_PATH, query, file_paths=file_paths, top_k=3)
+        actual = direct.search(BASE_PATH, query, file_paths=file_paths, top_k=3)
+        assert [r.content for r in actual] == [r.content for r in expected]
+        assert [r.score for r in actual] == pytest.approx([r.score for r in expected], abs=1e-5)
+    assert BASE_PATH in direct._direct_indexes
+
+    # Writes drop the in-memory copy
+    direct.delete_file_chunks(BASE_PATH, "b.md")
+    assert {r.metadata["file_path"] for r in direct.search(BASE_PATH, query, top_k=5)} == {"a.md"}
+
+
+def test_cleanup_old_collections(store):
+    """Test that only collections older than the cutoff are deleted."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 1)])
+    store.bulk_store_file_chunks("/other", [_file("b.md", "hb", 1)])
+    old = store.client.get_collection(store.get_collection_name("/other"))
+    old.modify(metadata={"created_at": "2000-01-01T00:00:00+00:00"})
+
+    assert store.cleanup_old_collections(days_to_keep=10) == 1
+    assert store.get_file_hashes("/other") == {}
+    assert store.get_file_hashes(BASE_PATH) == {"a.md": "ha"}
+
+
+def test_cleanup_compares_utc_timestamps_without_parsing(store, monkeypatch):
+    """Test that fresh UTC collections are kept without parsing their timestamp."""
+    import justragit.core.vector_store as vector_store_module
+
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 1)])
+
+    class NoParse(vector_store_module.datetime):
+        @classmethod
+        def fromisoformat(cls, value):
+            raise AssertionError("timestamp was parsed")
+
+    monkeypatch.setattr(vector_store_module, "datetime", NoParse)
+    assert store.cleanup_old_collections(days_to_keep=10) == 0
+
+
+def test_custom_template_fields_are_validated():
+    """Test that unknown template fields raise ValueError."""
+    result = SearchResult(content="text", score=0.5, metadata={"file_path": "a.md"}, chunk_index=2)
+
+    assert result.to_string("{file_path}#{chunk_index}: {score:.1f} {content}") == "a.md#2: 0.5 text"
+    with pytest.raises(ValueError, match="Invalid field in template: 'path'"):
+        result.to_string("{path}")
+    with pytest.raises(ValueError, match="Invalid field"):
+        format_results([result], "{score:{width}}")
+
+
+def test_warmup(tmp_path):
+    """Test warming up one collection, and every collection with the prefix."""
+    writer = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    writer.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 2)])
+    writer.bulk_store_file_chunks("/other", [_file("b.md", "hb", 2)])
+
+    direct = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    assert direct.warmup() == 2
+    assert set(direct._direct_indexes) == {BASE_PATH, "/other"}
+
+    hnsw = VectorStore(persist_directory=str(tmp_path / "chromadb"), direct_search_max_chunks=0)
+    assert hnsw.warmup(BASE_PATH) == 1
+    assert hnsw.warmup("/missing") == 0
+
+
+def test_existing_collection_is_not_recreated(tmp_path, monkeypatch):
+    """Test that an existing collection is opened without get_or_create_collection."""
+    VectorStore(persist_directory=str(tmp_path / "chromadb")).get_or_create_collection(BASE_PATH)
+
+    store = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("creation metadata was built for an existing collection")
+
+    monkeypatch.setattr(store.client, "get_or_create_collection", fail)
+    assert store.get_or_create_collection(BASE_PATH).name == store.get_collection_name(BASE_PATH)
+
+
+def test_search_bulk_matches_search(store):
+    """Test that search_bulk returns the same hits as search, as arrays."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+    query = [0.1, 0.2, 0.0, 0.9, 0.3, 0.0, 0.0, 0.0]
+
+    scores, documents, metadatas = store.search_bulk(BASE_PATH, query, top_k=3)
+    results = store.search(BASE_PATH, query, top_k=3)
+
+    assert scores.dtype.name == "float32"
+    assert documents == [r.content for r in results]
+    assert metadatas == [r.metadata for r in results]
+    assert scores.tolist() == pytest.approx([r.score for r in results])
+    assert len(store.search_bulk("/missing", query)[0]) == 0
+
+
+def test_store_without_metadata_and_without_mutating_it(store):
+    """Test that metadata is generated when omitted and caller dicts are left alone."""
+    store.store_file_chunks(BASE_PATH, "a.md", "ha", ["a0", "a1"], [_unit(0), _unit(1)])
+    caller_metadatas = [{"chunk_index": 5}, {"title": "B"}]
+    store.store_file_chunks(BASE_PATH, "b.md", "hb", ["b0", "b1"], [_unit(2), _unit(3)], caller_metadatas)
+
+    assert caller_metadatas == [{"chunk_index": 5}, {"title": "B"}]
+    assert store.get_chunks_by_indices(BASE_PATH, "a.md", [0, 1]) == {0: "a0", 1: "a1"}
+    assert store.get_chunks_by_indices(BASE_PATH, "b.md", [5, 1]) == {5: "b0", 1: "b1"}
+    assert store.get_file_hashes(BASE_PATH) == {"a.md": "ha", "b.md": "hb"}
+
+
+def test_chunk_ids_are_prefix_and_index(store, monkeypatch):
+    """Test chunk IDs, including files with more chunks than the preformatted indices."""
+    import justragit.core.vector_store as vector_store_module
+
+    monkeypatch.setattr(vector_store_module, "_INDEX_STRINGS", ["0", "1"])
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 4)])
+
+    prefix = vector_store_module._short_hash("a.md", 8)
+    assert store._file_chunk_ids(BASE_PATH, "a.md") == [f"{prefix}_{i}" for i in range(4)]
+
+
+def test_embeddings_are_stored_normalized(tmp_path):
+    """Test that new collections use inner product over unit-length embeddings."""
+    import numpy as np
+
+    store = VectorStore(persist_directory=str(tmp_path / "chromadb"), direct_search_max_chunks=0)
+    store.store_file_chunks(BASE_PATH, "a.md", "ha", ["a0", "a1"], [[3.0, 4.0, 0.0], [0.0, 0.0, 2.0]])
+
+    collection = store.get_or_create_collection(BASE_PATH)
+    assert collection.metadata["hnsw:space"] == "ip"
+    stored = np.asarray(collection.get(include=["embeddings"])["embeddings"])
+    assert np.linalg.norm(stored, axis=1) == pytest.approx([1.0, 1.0])
+
+    results = store.search(BASE_PATH, [6.0, 8.0, 0.0], top_k=2)
+    assert results[0].content == "a0"
+    assert results[0].score == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.parametrize("direct_search_max_chunks", [0, 50_000])
+def test_search_many_matches_search(tmp_path, direct_search_max_chunks):
+    """Test that search_many returns the same hits as one search per query."""
+    store = VectorStore(
+        persist_directory=str(tmp_path / "chromadb"),
+        query_cache_size=0,
+        direct_search_max_chunks=direct_search_max_chunks,
+    )
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)])
+    queries = [_unit(0), _unit(4), [0.1, 0.2, 0.0, 0.9, 0.3, 0.0, 0.0, 0.0]]
+
+    for file_paths in (None, ["b.md"]):
+        batched = store.search_many(BASE_PATH, queries, file_paths=file_paths, top_k=2)
+        assert len(batched) == 3
+        for query, results in zip(queries, batched):
+            expected = store.search(BASE_PATH, query, file_paths=file_paths, top_k=2)
+            assert [r.content for r in results] == [r.content for r in expected]
+
+    assert store.search_many("/missing", queries) == [[], [], []]
+
+
+def test_get_chunks_by_indices_fetches_only_requested_ids(store, monkeypatch):
+    """Test that chunks are fetched by their IDs instead of the whole file."""
+    store.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 50)])
+    store.get_file_hashes(BASE_PATH)
+
+    collection = store.get_or_create_collection(BASE_PATH)
+    original_get = type(collection).get
+    fetched = []
+
+    def recording_get(self, *args, **kwargs):
+        fetched.append(len(kwargs["ids"]))
+        return original_get(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(collection), "get", recording_get)
+
+    assert store.get_chunks_by_indices(BASE_PATH, "a.md", [3, 7]) == {3: "a.md chunk 3", 7: "a.md chunk 7"}
+    assert fetched == [2]
+
+
+def test_delete_without_loaded_index(tmp_path):
+    """Test deleting from a collection this store has not indexed yet."""
+    VectorStore(persist_directory=str(tmp_path / "chromadb")).bulk_store_file_chunks(
+        BASE_PATH, [_file("a.md", "ha", 3), _file("b.md", "hb", 2, 3)]
+    )
+
+    store = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    assert store.delete_file_chunks(BASE_PATH, "a.md") == 3
+    assert BASE_PATH not in store._path_ids
+    assert store.delete_file_chunks(BASE_PATH, "a.md") == 0
+    assert store.delete_file_chunks("/missing", "a.md") == 0
+    assert store.get_file_hashes(BASE_PATH) == {"b.md": "hb"}
+
+
+def test_file_index_side_file(tmp_path, monkeypatch):
+    """Test that a new store loads the file index from its side file when current."""
+    writer = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    writer.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 3)])
+    writer.get_file_hashes(BASE_PATH)
+    writer.bulk_store_file_chunks(BASE_PATH, [_file("b.md", "hb", 2, 3)])
+    writer.update_file_hash(BASE_PATH, "a.md", "ha2")
+    # Writes only mark the index dirty; it is saved once at the end
+    assert not list((tmp_path / "chromadb").glob("*.hashes.json"))
+    writer.save_file_index()
+    assert len(list((tmp_path / "chromadb").glob("*.hashes.json"))) == 1
+
+    reader = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    collection = reader.get_or_create_collection(BASE_PATH)
+    original_get = type(collection).get
+
+    def no_scan(self, *args, **kwargs):
+        assert "offset" not in kwargs, "collection was scanned"
+        return original_get(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(collection), "get", no_scan)
+    assert reader.get_file_hashes(BASE_PATH) == {"a.md": "ha2", "b.md": "hb"}
+    monkeypatch.undo()
+
+    # A write the side file did not see makes it stale, so it is rebuilt
+    VectorStore(persist_directory=str(tmp_path / "chromadb")).delete_file_chunks(BASE_PATH, "b.md")
+    assert VectorStore(persist_directory=str(tmp_path / "chromadb")).get_file_hashes(BASE_PATH) == {"a.md": "ha2"}
+
+
+def test_file_index_detects_same_size_rewrite(tmp_path):
+    """Test that a stale side file is ignored when the chunk count still matches."""
+    writer = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    writer.bulk_store_file_chunks(BASE_PATH, [_file("a.md", "ha", 2), _file("b.md", "hb", 1, 2)])
+    writer.get_file_hashes(BASE_PATH)
+    writer.save_file_index()
+    (side_file,) = (tmp_path / "chromadb").glob("*.hashes.json")
+    saved = side_file.read_bytes()
+
+    # A writer that leaves the side file in place, with the chunk count unchanged
+    other = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    other.delete_file_chunks(BASE_PATH, "b.md")
+    other.bulk_store_file_chunks(BASE_PATH, [_file("c.md", "hc", 1, 2)])
+    assert other.get_or_create_collection(BASE_PATH).count() == 3
+    side_file.write_bytes(saved)
+
+    reader = VectorStore(persist_directory=str(tmp_path / "chromadb"))
+    assert reader.get_file_hashes(BASE_PATH) == {"a.md": "ha", "c.md": "hc"}
+
+
+def _run_store_script(persist_directory, body: str) -> str:
+    """Run body in a fresh Python process with `store` open on persist_directory."""
+    script = textwrap.dedent(f"""
+        from justragit.core.vector_store import VectorStore
+        store = VectorStore(persist_directory={str(persist_directory)!r})
+        BASE_PATH = {BASE_PATH!r}
+    """) + textwrap.dedent(body)
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+def test_file_index_side_file_across_processes(tmp_path):
+    """Test that a side file saved by one process spares later processes the scan."""
+    persist_directory = tmp_path / "chromadb"
+    _run_store_script(persist_directory, """
+        store.bulk_store_file_chunks(BASE_PATH, [
+            ("a.md", "ha", ["a0", "a1"], [[1.0, 0.0], [0.0, 1.0]], None),
+            ("b.md", "hb", ["b0"], [[1.0, 1.0]], None),
+        ])
+        store.get_file_hashes(BASE_PATH)
+        store.save_file_index()
+    """)
+
+    load = """
+        collection = store.get_or_create_collection(BASE_PATH)
+        scans = []
+        original_get = type(collection).get
+
+        def get(self, *args, **kwargs):
+            if "offset" in kwargs:
+                scans.append(kwargs["offset"])
+            return original_get(self, *args, **kwargs)
+
+        type(collection).get = get
+        print(sorted(store.get_file_hashes(BASE_PATH).items()), "scanned" if scans else "loaded")
+    """
+    for _ in range(2):
+        assert _run_store_script(persist_directory, load) == (
+            "[('a.md', 'ha'), ('b.md', 'hb')] loaded"
+        )